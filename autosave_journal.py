@@ -0,0 +1,364 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import uuid
+
+from file_saver import atomic_write
+
+
+JOURNAL_VERSION = 1
+
+# Journal files are named "<session>-<id>.journal". The session holds a lock on
+# "<session>.lock" while it runs, so other instances leave its journals alone
+SESSION = uuid.uuid4().hex
+_session_locks = {}
+_session_guard = threading.Lock()
+
+
+def default_journal_dir():
+    """Per-user directory holding the journals of unsaved buffers"""
+    root = os.environ.get('APPDATA') or os.path.expanduser('~')
+    return os.path.join(root, 'CSER Editor', 'journal')
+
+
+def text_digest(text):
+    """Digest of buffer text as it appears in the widget ('\\n' newlines)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def read_text(path, encoding='utf-8'):
+    """Read a file the way FileLoader puts it into the widget"""
+    with open(path, 'rb') as file:
+        text = file.read().decode(encoding)
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _try_lock(file):
+    """Take a non-blocking exclusive lock on an open file; False if another process holds it"""
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _hold_session_lock(directory):
+    """Lock this session's file in directory for as long as the process runs"""
+    with _session_guard:
+        if directory in _session_locks:
+            return
+        os.makedirs(directory, exist_ok=True)
+        file = open(os.path.join(directory, f"{SESSION}.lock"), 'a+')
+        _try_lock(file)
+        _session_locks[directory] = file
+
+
+def _session_alive(directory, session):
+    """True while the instance that owns session still runs"""
+    try:
+        file = open(os.path.join(directory, f"{session}.lock"), 'a+')
+    except OSError:
+        return False
+    with file:
+        # The lock goes away with the process that held it
+        return not _try_lock(file)
+
+
+def _parse_index(index):
+    line, column = index.split('.')
+    return int(line) - 1, int(column)
+
+
+def replay(header, records):
+    """Rebuild the buffer text from a journal header and its edit records.
+
+    Raises ValueError when the journal is based on a file that has changed
+    on disk since, because the recorded positions no longer apply.
+    """
+    if header['base'] == 'text':
+        text = header['text']
+    else:
+        text = read_text(header['path'], header.get('encoding', 'utf-8'))
+        if text_digest(text) != header['digest']:
+            raise ValueError(f"{header['path']} changed on disk since the editor opened or saved it")
+
+    lines = text.split('\n')
+    for record in records:
+        if record[0] == 'i':
+            line, column = _parse_index(record[1])
+            current = lines[line]
+            lines[line:line + 1] = (current[:column] + record[2] + current[column:]).split('\n')
+        elif record[0] == 'd':
+            first_line, first_column = _parse_index(record[1])
+            last_line, last_column = _parse_index(record[2])
+            lines[first_line:last_line + 1] = [lines[first_line][:first_column] + lines[last_line][last_column:]]
+    return '\n'.join(lines)
+
+
+def load_journal(journal_path):
+    """Return (header, records) of a journal file; a torn final line is ignored"""
+    with open(journal_path, 'r', encoding='utf-8') as file:
+        header = json.loads(file.readline())
+        if header.get('version') != JOURNAL_VERSION:
+            raise ValueError(f"Unsupported journal version in {journal_path}")
+        records = []
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return header, records
+
+
+def find_journals(directory=None):
+    """Journal files left behind by sessions that did not exit cleanly, newest first.
+
+    Journals of this session and of other instances that are still running
+    are left out. Lock files of ended sessions are removed once none of
+    their journals remain.
+    """
+    directory = directory or default_journal_dir()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    sessions = {}
+    for name in names:
+        if name.endswith('.journal'):
+            session = name.partition('-')[0] if '-' in name else None
+            sessions.setdefault(session, []).append(name)
+    alive = {SESSION}
+    for name in names:
+        session = name[:-len('.lock')] if name.endswith('.lock') else None
+        if session and session != SESSION:
+            if _session_alive(directory, session):
+                alive.add(session)
+            elif session not in sessions:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+    paths = [
+        os.path.join(directory, name)
+        for session, journal_names in sessions.items() if session not in alive
+        for name in journal_names
+    ]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+class AutosaveJournal:
+    """Append-only journal of the edits made to one buffer since its last save.
+
+    Edits are queued as compact insert/delete records and appended to the
+    journal file by a worker thread every flush_ms, so autosave I/O grows with
+    what was typed rather than with the size of the file. Once the journal
+    holds compact_records edits it is rewritten as a snapshot of the buffer.
+    """
+
+    def __init__(self, text_widget, directory=None):
+        self.text_widget = text_widget
+        self.directory = directory or default_journal_dir()
+        self.flush_ms = 1000
+        self.compact_records = 2000
+
+        self.active = False
+        # Set while the buffer is not in the editor widget
+        self.paused = False
+        # Edits exist that are not on disk
+        self.dirty = False
+        self.journal_path = None
+        self._header = None
+        # (sequence, record) for every edit since the base, and the edits
+        # not yet handed to the worker
+        self._records = []
+        self._unflushed = []
+        self._sequence = 0
+        self._base_sequence = 0
+        self._written = False
+        self._after_id = None
+
+        self._jobs = queue.Queue()
+        self._worker = None
+
+    def begin(self, path=None, text=None, encoding='utf-8', persist=False, digest=None):
+        """Start a fresh journal whose base is the file at path or the given text.
+
+        A file base takes the text_digest() of the text loaded from path, so
+        recovery notices when the file changes on disk after it was opened.
+        The file is only created with the first edit unless persist is set,
+        which writes it right away (for buffers that differ from disk already).
+        """
+        self.discard()
+        self.journal_path = os.path.join(self.directory, f"{SESSION}-{uuid.uuid4().hex}.journal")
+        if path is not None and text is None:
+            if digest is None:
+                raise ValueError("A journal based on a file needs the digest of the loaded text")
+            self._header = {'version': JOURNAL_VERSION, 'path': path, 'encoding': encoding,
+                            'base': 'file', 'digest': digest}
+        else:
+            self._header = {'version': JOURNAL_VERSION, 'path': path, 'encoding': encoding,
+                            'base': 'text', 'text': text or ''}
+        # Saves checkpointed before this point belong to the previous buffer
+        self._sequence += 1
+        self._base_sequence = self._sequence
+        self.active = True
+        self.dirty = persist
+        if persist:
+            self._rewrite()
+
+    def suspend(self):
+        """Stop recording, e.g. while a file is streamed into the widget"""
+        self.discard()
+
+    def pause(self):
+        """Hand pending edits to the worker and stop reading the widget.
+
+        Used while another buffer occupies the widget; the journal file and
+        the records since the base are kept for resume().
+        """
+        self.flush()
+        self.paused = True
+
+    def resume(self):
+        """Continue recording once the buffer is back in the widget"""
+        self.paused = False
+
+    def discard(self):
+        """Stop recording and delete the journal file"""
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+        if self._written:
+            self._submit(('delete', self.journal_path))
+        self.active = False
+        self.journal_path = None
+        self._header = None
+        self._records = []
+        self._unflushed = []
+        self._written = False
+        self.dirty = False
+
+    def close(self):
+        """Discard the journal and stop its writer thread once queued writes are done"""
+        self.discard()
+        if self._worker is not None:
+            self._jobs.put(('stop',))
+            self._worker = None
+
+    def record(self, operation, *args):
+        """Edit listener: ('insert', index, text) or ('delete', first, last)"""
+        if not self.active or self.paused:
+            return
+        self.dirty = True
+        self._sequence += 1
+        if operation == 'insert':
+            entry = ('i', args[0], args[1])
+        else:
+            entry = ('d', args[0], args[1])
+        self._records.append((self._sequence, entry))
+        self._unflushed.append(entry)
+        if self._after_id is None:
+            self._after_id = self.text_widget.after(self.flush_ms, self.flush)
+
+    def checkpoint(self):
+        """Sequence number of the latest edit, to pass to saved() later"""
+        return self._sequence
+
+    def saved(self, path, content, checkpoint, encoding='utf-8'):
+        """Rebase the journal on a completed save of content taken at checkpoint"""
+        if not self.active:
+            return
+        if checkpoint < self._base_sequence:
+            # A compaction snapshot already covers this save
+            return
+        self._records = [(sequence, entry) for sequence, entry in self._records if sequence > checkpoint]
+        self._base_sequence = checkpoint
+        self._header = {'version': JOURNAL_VERSION, 'path': path, 'encoding': encoding,
+                        'base': 'file', 'digest': None, 'content': content}
+        self._unflushed = []
+        self.dirty = bool(self._records)
+        if self._records:
+            self._rewrite()
+        elif self._written:
+            self._submit(('delete', self.journal_path))
+            self._written = False
+
+    def flush(self):
+        """Hand queued edits to the worker; compact when the journal has grown"""
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+        if not self.active or self.paused or not self._unflushed:
+            return
+
+        if len(self._records) >= self.compact_records:
+            self._header = {'version': JOURNAL_VERSION, 'path': self._header['path'],
+                            'encoding': self._header['encoding'], 'base': 'text',
+                            'text': self.text_widget.get('1.0', 'end-1c')}
+            self._records = []
+            self._base_sequence = self._sequence
+            self._unflushed = []
+            self._rewrite()
+        elif not self._written:
+            self._unflushed = []
+            self._rewrite()
+        else:
+            self._submit(('append', self.journal_path, self._unflushed))
+            self._unflushed = []
+
+    def wait(self):
+        """Block until every queued journal write has finished"""
+        self._jobs.join()
+
+    def _rewrite(self):
+        """Replace the journal file with the current header and records"""
+        self._submit(('rewrite', self.journal_path, dict(self._header),
+                      [entry for _, entry in self._records]))
+        self._written = True
+
+    def _submit(self, job):
+        self._jobs.put(job)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name="autosave-journal", daemon=True)
+            self._worker.start()
+
+    def _work(self):
+        """Worker thread: journal writes run one at a time in the order they were queued, until close()"""
+        while True:
+            job = self._jobs.get()
+            try:
+                if job[0] == 'stop':
+                    return
+                if job[0] == 'append':
+                    _, journal_path, entries = job
+                    with open(journal_path, 'a', encoding='utf-8') as file:
+                        for entry in entries:
+                            file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                        file.flush()
+                        os.fsync(file.fileno())
+                elif job[0] == 'rewrite':
+                    _, journal_path, header, entries = job
+                    if header['base'] == 'file' and header['digest'] is None:
+                        # Saves hand over their text; hash it here, off the mainloop
+                        header['digest'] = text_digest(header.pop('content'))
+                    lines = [json.dumps(header, ensure_ascii=False)]
+                    lines.extend(json.dumps(entry, ensure_ascii=False) for entry in entries)
+                    _hold_session_lock(os.path.dirname(journal_path))
+                    atomic_write(journal_path, ('\n'.join(lines) + '\n').encode('utf-8'))
+                elif job[0] == 'delete':
+                    try:
+                        os.unlink(job[1])
+                    except FileNotFoundError:
+                        pass
+            except Exception as e:
+                print(f"Autosave journal write failed: {e}")
+            finally:
+                self._jobs.task_done()
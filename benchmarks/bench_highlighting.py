@@ -0,0 +1,234 @@
+"""Headless benchmarks for the Pawn lexer and SyntaxHighlighter.
+
+Runs against a mock text widget, so no display is needed:
+
+    python benchmarks/bench_highlighting.py
+    python benchmarks/bench_highlighting.py --sizes 1000 10000 --corpus path/to/scripting
+    python benchmarks/bench_highlighting.py --json > results.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pawn_lexer import PawnLexer
+from syntax_highlighter import SyntaxHighlighter
+
+
+class MockText:
+    """Just enough of tk.Text for SyntaxHighlighter, counting tag round-trips"""
+
+    def __init__(self, content):
+        self.lines = content.split('\n')
+        self.view = (0.0, 0.0)
+        self.callbacks = {}
+        self.next_id = 0
+        self.tag_calls = 0
+        self.tag_ranges = 0
+
+    def tag_configure(self, tag, **options):
+        pass
+
+    def get(self, start, end):
+        return '\n'.join(self.lines)
+
+    def insert(self, index, text):
+        line, column = (int(part) for part in index.split('.'))
+        current = self.lines[line - 1]
+        new_lines = (current[:column] + text + current[column:]).split('\n')
+        self.lines[line - 1:line] = new_lines
+
+    def tag_add(self, tag, *indices):
+        self.tag_calls += 1
+        self.tag_ranges += len(indices) // 2
+
+    def tag_remove(self, tag, start, end=None):
+        self.tag_calls += 1
+
+    def yview(self):
+        return self.view
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_pending(self):
+        """Run scheduled callbacks until the highlighter has no work left"""
+        while self.callbacks:
+            after_id = min(self.callbacks)
+            self.callbacks.pop(after_id)()
+            if self.callbacks:
+                # Give the lexer thread a chance while only polling remains
+                time.sleep(0.0005)
+
+
+def generate_source(line_count, seed=0):
+    """Generate Pawn source with heavy comments, many strings and deep nesting"""
+    rng = random.Random(seed)
+    lines = ['#include <amxmodx>', '#include <fakemeta>', '']
+    depth = 0
+    while len(lines) < line_count:
+        indent = '    ' * depth
+        roll = rng.random()
+        if roll < 0.08:
+            lines.append(f'{indent}/*')
+            for _ in range(rng.randint(1, 6)):
+                lines.append(f'{indent} * if (x) return "not code"; // {rng.random():.5f}')
+            lines.append(f'{indent} */')
+        elif roll < 0.25:
+            lines.append(f'{indent}client_print(id, print_chat, "[CSER] %s has ^"%d^" frags", name, {rng.randint(0, 999)}); // notify')
+        elif roll < 0.35:
+            lines.append(f'{indent}new const g_szSound[] = "sound/cser/{rng.randint(0, 99)}.wav", g_cChar = \'x\';')
+        elif roll < 0.55 and depth < 12:
+            lines.append(f'{indent}if (is_user_alive(id) && get_user_team(id) == {rng.randint(1, 3)}) {{')
+            depth += 1
+        elif roll < 0.7 and depth:
+            depth -= 1
+            lines.append('    ' * depth + '}')
+        elif roll < 0.75 and not depth:
+            lines.append(f'public plugin_func_{len(lines)}(id, Float:fValue) {{')
+            depth = 1
+        else:
+            lines.append(f'{indent}new iValue = {rng.randint(0, 100000)} + 0x{rng.randint(0, 255):02X}; // {rng.random():.3f}')
+    return '\n'.join(lines[:line_count])
+
+
+def load_corpus(directory):
+    """Concatenate every .sma and .inc file under directory"""
+    sources = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.endswith(('.sma', '.inc')):
+                with open(os.path.join(root, name), 'r', encoding='utf-8', errors='replace') as file:
+                    sources.append(file.read())
+    return '\n'.join(sources)
+
+
+def summarize(name, corpus, samples):
+    """Turn raw timings in seconds into a comparable result row"""
+    ordered = sorted(samples)
+    p99_index = min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))
+    mean = statistics.fmean(ordered)
+    return {
+        'benchmark': name,
+        'corpus': corpus,
+        'runs': len(ordered),
+        'ops_per_sec': 1.0 / mean if mean else float('inf'),
+        'p50_ms': statistics.median(ordered) * 1000,
+        'p99_ms': ordered[p99_index] * 1000,
+    }
+
+
+def new_highlighter(content):
+    """Return a highlighter over a fresh mock widget showing the top of the file"""
+    widget = MockText(content)
+    line_count = len(widget.lines)
+    widget.view = (0.0, min(1.0, 60 / line_count))
+    return widget, SyntaxHighlighter(widget)
+
+
+def bench_lexer(corpus, content, repeat):
+    """Time PawnLexer.tokenize over the whole buffer"""
+    lexer = PawnLexer()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lexer.tokenize(content)
+        samples.append(time.perf_counter() - start)
+    return summarize('lex', corpus, samples)
+
+
+def bench_full_highlight(corpus, content, repeat):
+    """Time a cold highlight of the whole buffer, background work included"""
+    samples = []
+    for _ in range(repeat):
+        widget, highlighter = new_highlighter(content)
+        start = time.perf_counter()
+        highlighter.highlight_syntax()
+        widget.run_pending()
+        samples.append(time.perf_counter() - start)
+    return summarize('full_highlight', corpus, samples)
+
+
+def bench_keystroke(corpus, content, repeat):
+    """Time re-highlighting after typing one character in the middle of the file"""
+    widget, highlighter = new_highlighter(content)
+    highlighter.highlight_syntax()
+    widget.run_pending()
+
+    rng = random.Random(1)
+    samples = []
+    for _ in range(repeat * 10):
+        line = rng.randint(1, len(widget.lines))
+        widget.insert(f"{line}.0", 'x')
+        start = time.perf_counter()
+        highlighter.highlight_syntax()
+        widget.run_pending()
+        samples.append(time.perf_counter() - start)
+    return summarize('keystroke', corpus, samples)
+
+
+def bench_tag_application(corpus, content, repeat):
+    """Time pushing every line's tokens into the widget, lexing excluded"""
+    widget, highlighter = new_highlighter(content)
+    highlighter.highlight_syntax()
+    widget.run_pending()
+
+    line_count = len(highlighter.lines)
+    samples = []
+    calls = []
+    for _ in range(repeat):
+        highlighter.applied_tokens = [None] * line_count
+        widget.tag_calls = 0
+        start = time.perf_counter()
+        for batch_start in range(0, line_count, highlighter.chunk_lines):
+            highlighter._apply_lines(list(range(batch_start, min(line_count, batch_start + highlighter.chunk_lines))))
+        samples.append(time.perf_counter() - start)
+        calls.append(widget.tag_calls)
+    result = summarize('tag_application', corpus, samples)
+    result['tag_calls'] = max(calls)
+    return result
+
+
+BENCHMARKS = (bench_lexer, bench_full_highlight, bench_keystroke, bench_tag_application)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Pawn lexing and syntax highlighting")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="line counts of the generated sources")
+    parser.add_argument('--corpus', action='append', default=[],
+                        help="directory of real .sma/.inc files to benchmark as well")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    corpora = [(f"generated-{size}", generate_source(size)) for size in args.sizes]
+    for directory in args.corpus:
+        corpora.append((os.path.basename(os.path.normpath(directory)), load_corpus(directory)))
+
+    results = []
+    for corpus, content in corpora:
+        for benchmark in BENCHMARKS:
+            results.append(benchmark(corpus, content, args.repeat))
+            if not args.json:
+                row = results[-1]
+                print(f"{row['corpus']:<20} {row['benchmark']:<16} {row['ops_per_sec']:>12.2f} ops/s "
+                      f"p50 {row['p50_ms']:>10.3f} ms  p99 {row['p99_ms']:>10.3f} ms")
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+import os
+import time
+
+from autosave_journal import AutosaveJournal
+from syntax_highlighter import SyntaxHighlighter
+
+
+class Buffer:
+    """An open document. Only the active buffer lives in the editor widget"""
+
+    def __init__(self, path=None):
+        self.path = path
+        # Text, cursor and scroll position, kept while the buffer is inactive
+        self.text = ''
+        self.insert = '1.0'
+        self.yview = 0.0
+        # SyntaxHighlighter.snapshot() of the buffer, dropped under memory pressure
+        self.highlight_cache = None
+        self.highlight_cache_bytes = 0
+        self.journal = None
+        self.last_used = 0.0
+
+    @property
+    def name(self):
+        return os.path.basename(self.path) if self.path else "Untitled"
+
+
+class BufferManager:
+    """Tabs over one editor widget: switching swaps text and cached highlighting in and out.
+
+    Inactive buffers hold plain data only. Their highlight caches are kept
+    within cache_budget_bytes, dropping the least recently used first; a
+    buffer without one is lexed again when it is switched back in.
+    """
+
+    def __init__(self, app, cache_budget_bytes=64 * 1024 * 1024):
+        self.app = app
+        self.cache_budget_bytes = cache_budget_bytes
+        self.buffers = []
+        self.active = None
+        # Called after buffers are added, closed or switched
+        self.on_change = None
+
+    def adopt(self, path=None):
+        """Make a buffer of whatever the editor widget holds right now"""
+        buffer = self._create(path)
+        buffer.journal.begin(path=path, text=self.app.code_editor.get("1.0", "end-1c"))
+        self.app.current_file = path
+        self.active = buffer
+        buffer.last_used = time.monotonic()
+        self._changed()
+        return buffer
+
+    def add(self, path=None):
+        """Open a new empty buffer and switch to it"""
+        buffer = self._create(path)
+        buffer.journal.begin(path=path, text='')
+        self.activate(buffer)
+        return buffer
+
+    def add_or_reuse(self, path=None):
+        """Switch to a new buffer, reusing the active one if it is untitled and unmodified"""
+        active = self.active
+        if active is not None and active.path is None and not active.journal.dirty:
+            return active
+        return self.add(path)
+
+    def find(self, path):
+        """The buffer showing path, if any"""
+        key = os.path.normcase(os.path.abspath(path))
+        for buffer in self.buffers:
+            if buffer.path and os.path.normcase(os.path.abspath(buffer.path)) == key:
+                return buffer
+        return None
+
+    def activate(self, buffer):
+        """Put buffer into the editor widget, stashing the active one"""
+        if buffer is self.active:
+            return
+        app = self.app
+        editor = app.code_editor
+        if self.active is not None:
+            self._stash(self.active)
+        # The swap below is not an edit of any buffer
+        self.active = None
+
+        app.syntax_highlighter.reset()
+        editor.delete("1.0", "end")
+        editor.insert("1.0", buffer.text)
+        # Tk cannot keep one undo stack per buffer
+        editor.edit_reset()
+        buffer.text = ''
+        editor.mark_set("insert", buffer.insert)
+        editor.yview_moveto(buffer.yview)
+
+        if buffer.highlight_cache is not None:
+            app.syntax_highlighter.restore(buffer.highlight_cache)
+        else:
+            app.syntax_highlighter.highlight_syntax()
+        buffer.highlight_cache = None
+        buffer.highlight_cache_bytes = 0
+
+        buffer.journal.resume()
+        app.current_file = buffer.path
+        buffer.last_used = time.monotonic()
+        self.active = buffer
+        self._evict()
+        self._changed()
+
+    def close(self, buffer):
+        """Close a buffer without saving; the nearest remaining one becomes active"""
+        buffer.journal.close()
+        index = self.buffers.index(buffer)
+        self.buffers.remove(buffer)
+        if buffer is not self.active:
+            self._changed()
+            return
+        self.active = None
+        if self.buffers:
+            self.activate(self.buffers[min(index, len(self.buffers) - 1)])
+        else:
+            self.add()
+
+    def _create(self, path):
+        buffer = Buffer(path)
+        buffer.journal = AutosaveJournal(self.app.code_editor)
+        self.buffers.append(buffer)
+        return buffer
+
+    def _stash(self, buffer):
+        """Copy the active buffer's state out of the widget"""
+        app = self.app
+        editor = app.code_editor
+        buffer.path = app.current_file
+        buffer.journal.pause()
+        buffer.text = editor.get("1.0", "end-1c")
+        buffer.insert = editor.index("insert")
+        buffer.yview = editor.yview()[0]
+        buffer.highlight_cache = app.syntax_highlighter.snapshot()
+        if buffer.highlight_cache is not None:
+            buffer.highlight_cache_bytes = SyntaxHighlighter.snapshot_size(buffer.highlight_cache)
+        buffer.last_used = time.monotonic()
+
+    def _evict(self):
+        """Drop highlight caches of inactive buffers, least recently used first, to fit the budget"""
+        cached = sorted(
+            (buffer for buffer in self.buffers if buffer is not self.active and buffer.highlight_cache is not None),
+            key=lambda buffer: buffer.last_used
+        )
+        total = sum(buffer.highlight_cache_bytes for buffer in cached)
+        for buffer in cached:
+            if total <= self.cache_budget_bytes:
+                break
+            total -= buffer.highlight_cache_bytes
+            buffer.highlight_cache = None
+            buffer.highlight_cache_bytes = 0
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
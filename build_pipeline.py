@@ -0,0 +1,202 @@
+import itertools
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+
+from compiler_output import kill_compiler, read_output, start_compiler
+
+
+STAGES = ('compile', 'verify', 'deploy')
+
+
+class MainloopWakeup:
+    """Run a callback on the mainloop when a worker thread asks for it.
+
+    notify() generates a virtual event on the widget, which threaded Tcl
+    hands to the mainloop like any other event; notifications made before
+    the callback runs collapse into one. Nothing is polled in between.
+    close() removes the binding again once no more wakeups are wanted.
+    """
+
+    _ids = itertools.count()
+
+    def __init__(self, widget, callback):
+        self.widget = widget
+        self.callback = callback
+        self.sequence = f"<<Wakeup{next(self._ids)}>>"
+        self._pending = False
+        self._closed = False
+        self._lock = threading.Lock()
+        self._funcid = widget.bind(self.sequence, self._fire, add='+')
+
+    def notify(self):
+        """Callable from any thread"""
+        with self._lock:
+            if self._pending or self._closed:
+                return
+            self._pending = True
+        try:
+            self.widget.event_generate(self.sequence, when='tail')
+        except (tk.TclError, RuntimeError):
+            pass  # The window is gone
+
+    def close(self):
+        """Mainloop: unbind the event; later notifications are ignored"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self.widget.unbind(self.sequence, self._funcid)
+        except tk.TclError:
+            pass  # The window is gone
+
+    def _fire(self, event=None):
+        with self._lock:
+            self._pending = False
+            if self._closed:
+                return
+        self.callback()
+
+
+class BuildPipeline:
+    """Compile a plugin, wait for the compiler, verify the build and deploy it.
+
+    The stages run one after another on a worker thread:
+    compile - run the compiler until it exits, streaming its output;
+    verify  - the exit code is 0 and the .amxx at output_path was written by
+              this run (its stat differs from before the compile);
+    deploy  - call deploy() on the worker thread, only after a verified build.
+    Each stage is timed. Progress reaches the mainloop through
+    MainloopWakeup, so the UI never polls while a build runs.
+    """
+
+    def __init__(self, widget, command, cwd, output_path, deploy,
+                 on_line=None, on_stage=None, on_done=None):
+        self.command = command
+        self.cwd = cwd
+        self.output_path = output_path
+        # deploy() -> True on success; file work only, it runs on the worker thread
+        self.deploy = deploy
+        # on_line(text) per compiler output line,
+        # on_stage(stage, status, seconds, detail) with status 'running', 'ok', 'failed' or 'cancelled',
+        # on_done(result, timings) with result 'deployed', 'failed' or 'cancelled' and {stage: seconds}
+        self.on_line = on_line
+        self.on_stage = on_stage
+        self.on_done = on_done
+        # Time spent handing events to the callbacks per mainloop iteration
+        self.event_budget_ms = 10
+
+        self.process = None
+        self.returncode = None
+        self.cancelled = False
+        self.finished = False
+        self.timings = {}
+        # Stat of the .amxx before the compile, to tell a fresh build from a stale file
+        self._before = None
+        self._events = queue.Queue()
+        self._wakeup = MainloopWakeup(widget, self._deliver)
+
+    def start(self):
+        threading.Thread(target=self._run, name="build-pipeline", daemon=True).start()
+
+    def cancel(self):
+        """Stop the build; nothing is deployed afterwards"""
+        if self.finished or self.cancelled:
+            return
+        self.cancelled = True
+        process = self.process
+        if process is not None:
+            # taskkill can take a moment; keep it off the mainloop
+            threading.Thread(target=kill_compiler, args=(process,), name="build-cancel", daemon=True).start()
+
+    def _post(self, *event):
+        self._events.put(event)
+        self._wakeup.notify()
+
+    def _output_stat(self):
+        try:
+            stat = os.stat(self.output_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _run(self):
+        """Worker thread: the stages in order, stopping at the first that fails"""
+        result = 'failed'
+        try:
+            for stage in STAGES:
+                if self.cancelled:
+                    result = 'cancelled'
+                    break
+                self._post('stage', stage, 'running', 0.0, None)
+                started = time.perf_counter()
+                ok, detail = getattr(self, f"_{stage}")()
+                seconds = time.perf_counter() - started
+                self.timings[stage] = seconds
+                if self.cancelled and stage != 'deploy':
+                    self._post('stage', stage, 'cancelled', seconds, None)
+                    result = 'cancelled'
+                    break
+                self._post('stage', stage, 'ok' if ok else 'failed', seconds, detail)
+                if not ok:
+                    break
+            else:
+                result = 'deployed'
+        except Exception as e:
+            self._post('line', f"Build failed: {e}")
+        self._post('done', result)
+
+    def _compile(self):
+        self._before = self._output_stat()
+        try:
+            self.process = start_compiler(self.command, self.cwd)
+        except OSError as e:
+            return False, f"could not start the compiler: {e}"
+        if self.cancelled:
+            kill_compiler(self.process)
+        for line in read_output(self.process):
+            self._post('line', line)
+        self.returncode = self.process.wait()
+        return True, f"exit code {self.returncode}"
+
+    def _verify(self):
+        if self.returncode != 0:
+            return False, f"the compiler exited with code {self.returncode}"
+        after = self._output_stat()
+        if after is None:
+            return False, f"{os.path.basename(self.output_path)} was not written"
+        if after == self._before:
+            return False, f"{os.path.basename(self.output_path)} is left over from an earlier build"
+        return True, None
+
+    def _deploy(self):
+        if not self.deploy():
+            return False, "copying the plugin or updating plugins.ini failed"
+        return True, None
+
+    def _deliver(self):
+        """Mainloop: hand queued events to the callbacks for a bounded slice of time"""
+        deadline = time.perf_counter() + self.event_budget_ms / 1000
+        while time.perf_counter() < deadline:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return
+            if event[0] == 'line':
+                if self.on_line:
+                    self.on_line(event[1])
+            elif event[0] == 'stage':
+                if self.on_stage:
+                    self.on_stage(*event[1:])
+            else:
+                # Nothing follows 'done'; each build binds its own event, so release it
+                self.finished = True
+                self._wakeup.close()
+                if self.on_done:
+                    self.on_done(event[1], dict(self.timings))
+                return
+        # More is queued; continue after the events already waiting
+        self._wakeup.notify()
@@ -0,0 +1,123 @@
+def single_undo_step(text_widget, edit):
+    """Run edit() on a tk.Text so that one undo reverts all of it"""
+    autoseparators = text_widget.cget('autoseparators')
+    text_widget.configure(autoseparators=False)
+    text_widget.edit_separator()
+    try:
+        edit()
+    finally:
+        text_widget.edit_separator()
+        text_widget.configure(autoseparators=autoseparators)
+
+
+class ChangeTracker:
+    """Proxy around a tk.Text widget command that reports exact edit ranges.
+
+    Every insert, delete and replace - typed, pasted, programmatic or replayed
+    by undo/redo - passes through the proxy, which calls
+    callback(first, old_end, new_end) afterwards: the 0-based lines
+    [first, old_end) of the old text became lines [first, new_end).
+
+    Listeners added with add_edit_listener() additionally receive each edit
+    as plain operations: listener('insert', index, text) and
+    listener('delete', first, last), with indices resolved to "line.column".
+    """
+
+    def __init__(self, text_widget, callback):
+        self.text_widget = text_widget
+        self.callback = callback
+        self._widget_name = str(text_widget)
+        self._original = self._widget_name + "_original"
+        self._edit_listeners = []
+
+        # Move the real widget command aside and answer under its name
+        tk = text_widget.tk
+        tk.call("rename", self._widget_name, self._original)
+        tk.createcommand(self._widget_name, self._dispatch)
+
+    def close(self):
+        """Remove the proxy and restore the original widget command"""
+        tk = self.text_widget.tk
+        tk.deletecommand(self._widget_name)
+        tk.call("rename", self._original, self._widget_name)
+
+    def add_edit_listener(self, listener):
+        """Receive every edit as resolved insert/delete operations"""
+        self._edit_listeners.append(listener)
+
+    def _line(self, index):
+        """Resolve an index to its 1-based line through the original command"""
+        return int(str(self.text_widget.tk.call(self._original, 'index', index)).split('.')[0])
+
+    def _dispatch(self, operation, *args):
+        """Forward a widget command, noting which lines it changed"""
+        tk = self.text_widget.tk
+        if operation not in ('insert', 'delete', 'replace') or not args:
+            return tk.call((self._original, operation) + args)
+
+        if operation == 'insert':
+            indices = args[:1]
+        elif operation == 'replace':
+            indices = args[:2]
+        elif len(args) == 1:
+            indices = (args[0], f"{args[0]}+1c")
+        else:
+            indices = args
+
+        # Tk never edits past the final newline, so clamp to the last line
+        last_line = self._line('end-1c')
+        lines = [min(self._line(index), last_line) for index in indices]
+
+        operations = self._operations(operation, args) if self._edit_listeners else ()
+
+        result = tk.call((self._original, operation) + args)
+
+        for listener in self._edit_listeners:
+            for edit in operations:
+                try:
+                    listener(*edit)
+                except Exception as e:
+                    print(f"Edit listener failed: {e}")
+
+        line_delta = self._line('end-1c') - last_line
+        first = min(lines) - 1
+        old_end = max(lines)
+        try:
+            self.callback(first, old_end, old_end + line_delta)
+        except Exception as e:
+            print(f"Change callback failed: {e}")
+        return result
+
+    def _resolve(self, index):
+        """Resolve an index through the original command, clamped to the editable text"""
+        tk = self.text_widget.tk
+        resolved = str(tk.call(self._original, 'index', index))
+        if tk.getboolean(tk.call(self._original, 'compare', resolved, '>', 'end-1c')):
+            resolved = str(tk.call(self._original, 'index', 'end-1c'))
+        return resolved
+
+    def _operations(self, operation, args):
+        """Translate a widget command into the insert/delete operations it performs"""
+        tk = self.text_widget.tk
+        if operation == 'insert':
+            return [('insert', self._resolve(args[0]), ''.join(args[1::2]))]
+
+        if operation == 'replace':
+            ranges = [args[:2]]
+        else:
+            ranges = [args[i:i + 2] for i in range(0, len(args), 2)]
+
+        deletes = []
+        for pair in ranges:
+            first = self._resolve(pair[0])
+            last = self._resolve(pair[1] if len(pair) > 1 else f"{pair[0]}+1c")
+            if tk.getboolean(tk.call(self._original, 'compare', first, '<', last)):
+                deletes.append((first, last))
+        # Delete from the bottom up so earlier ranges keep their positions
+        deletes.sort(key=lambda pair: tuple(int(part) for part in pair[0].split('.')), reverse=True)
+        operations = [('delete', first, last) for first, last in deletes]
+
+        if operation == 'replace':
+            first = self._resolve(args[0])
+            operations.append(('insert', first, ''.join(args[2::2])))
+        return operations
@@ -0,0 +1,70 @@
+import locale
+import os
+import re
+import subprocess
+
+
+# file.sma(123) : error 017: undefined symbol "foo"
+# compile.exe prefixes its lines with "// " and statements spanning lines read file.sma(12 -- 15).
+# Paths may hold parentheses themselves (C:\Program Files (x86)\...), so the path
+# ends at the first "(line) : kind code :" rather than at the first "("
+DIAGNOSTIC_PATTERN = re.compile(
+    r'^(?:\s*//\s*)?(?P<path>.+?)\((?P<line>\d+)(?:\s*--\s*(?P<end_line>\d+))?\)\s*:\s*'
+    r'(?P<kind>fatal error|error|warning)\s+(?P<code>\d+)\s*:\s*(?P<message>.*)$'
+)
+
+
+def parse_diagnostic(text, directory=None):
+    """(path, line, kind, code, message) for a compiler diagnostic line, else None.
+
+    line is 1-based; for a statement spanning lines it is the last one, where
+    the compiler noticed the problem. Relative paths are taken against directory.
+    """
+    match = DIAGNOSTIC_PATTERN.match(text)
+    if match is None:
+        return None
+    path = match['path'].strip()
+    if directory and not os.path.isabs(path):
+        path = os.path.join(directory, path)
+    line = int(match['end_line'] or match['line'])
+    return path, line, match['kind'], match['code'], match['message'].strip()
+
+
+def start_compiler(command, cwd=None):
+    """Launch the compiler with stdout and stderr merged into one pipe; raises OSError"""
+    kwargs = {}
+    if os.name == 'nt':
+        # Output goes to the editor, not a console window
+        kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+    return subprocess.Popen(
+        command,
+        cwd=cwd,
+        # compile.exe waits for Enter before exiting; end of input answers it
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        **kwargs
+    )
+
+
+def read_output(process):
+    """Yield the compiler's output lines as they arrive; blocks, so call it off the mainloop"""
+    encoding = locale.getpreferredencoding(False)
+    with process.stdout:
+        for raw in iter(process.stdout.readline, b''):
+            yield raw.decode(encoding, errors='replace').rstrip('\r\n')
+
+
+def kill_compiler(process):
+    """Stop the compiler together with the amxxpc processes it started"""
+    if process.poll() is not None:
+        return
+    if os.name == 'nt':
+        subprocess.run(
+            ['taskkill', '/F', '/T', '/PID', str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        )
+    else:
+        process.kill()
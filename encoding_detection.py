@@ -0,0 +1,87 @@
+import codecs
+import mmap
+import os
+import re
+
+
+# Tried in order once a file turns out not to be plain ASCII; latin-1 decodes
+# any byte sequence, so it belongs last
+DEFAULT_CANDIDATES = ('utf-8', 'cp1254', 'cp1252', 'latin-1')
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+
+def _detect_newline(text):
+    """Newline convention of the first line break in text"""
+    position = text.find('\n')
+    if position > 0 and text[position - 1] == '\r':
+        return '\r\n'
+    if position == -1 and '\r' in text:
+        return '\r'
+    if position == -1:
+        return os.linesep
+    return '\n'
+
+
+def _decodes(view, start, encoding, window):
+    """Whether view decodes as encoding from start on, judged window by window.
+
+    The first window whose text holds a non-ASCII character settles it; only
+    a window that ends inside a multibyte sequence makes the next one needed.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)()
+    except LookupError:
+        return False
+    position = start
+    size = len(view)
+    while position < size:
+        chunk = view[position:position + window]
+        position += len(chunk)
+        try:
+            text = decoder.decode(chunk, position >= size)
+        except UnicodeDecodeError:
+            return False
+        if not text.isascii():
+            return True
+    return True
+
+
+def detect_encoding(path, candidates=DEFAULT_CANDIDATES, sample_size=64 * 1024):
+    """Return (encoding, newline) for a file so it can be saved back byte for byte.
+
+    A BOM wins outright. Otherwise the file is memory-mapped and scanned for
+    the first non-ASCII byte; pure ASCII files are reported as UTF-8 and
+    everything else is decoded from that byte on with each candidate in turn,
+    sample_size bytes at a time, so large files are never read whole.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return candidates[0], os.linesep
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            prefix = view[:sample_size]
+            for bom, encoding in _BOMS:
+                if prefix.startswith(bom):
+                    return encoding, _detect_newline(prefix.decode(encoding, errors='ignore'))
+
+            newline = _detect_newline(prefix.decode('latin-1'))
+            if prefix.isascii():
+                if len(view) <= sample_size:
+                    return 'utf-8', newline
+                match = _NON_ASCII.search(view, sample_size)
+            else:
+                match = _NON_ASCII.search(prefix)
+            if match is None:
+                return 'utf-8', newline
+
+            # Everything before the first non-ASCII byte decodes the same way
+            # in every candidate, so only what follows it needs checking
+            for encoding in candidates:
+                if _decodes(view, match.start(), encoding, sample_size):
+                    return encoding, newline
+    return 'latin-1', newline
@@ -0,0 +1,131 @@
+import codecs
+import hashlib
+import os
+import queue
+import threading
+import time
+
+from encoding_detection import DEFAULT_CANDIDATES, detect_encoding
+
+
+class FileLoader:
+    """Read a file on a worker thread and stream it into a text widget in chunks"""
+
+    def __init__(self, text_widget, path, encoding=None, on_progress=None,
+                 on_first_chunk=None, on_done=None, chunk_size=256 * 1024,
+                 candidates=DEFAULT_CANDIDATES):
+        self.text_widget = text_widget
+        self.path = path
+        # With no encoding given, the worker detects encoding and newline
+        # style before reading; both are set by the time on_done runs.
+        # An explicit encoding leaves newline as None
+        self.encoding = encoding
+        self.newline = None
+        # SHA-256 of the text put into the widget, as autosave_journal.text_digest()
+        # gives it; set by the time on_done runs for a complete load
+        self.digest = None
+        self.candidates = candidates
+        # on_progress(fraction), on_first_chunk() once the top of the file is
+        # in the widget, on_done(error, cancelled) when loading stops
+        self.on_progress = on_progress
+        self.on_first_chunk = on_first_chunk
+        self.on_done = on_done
+        self.chunk_size = chunk_size
+        # Time spent inserting per mainloop iteration
+        self.insert_budget_ms = 12
+
+        self.cancelled = False
+        self.finished = False
+        self._chunks = queue.Queue(maxsize=16)
+        self._first_chunk_seen = False
+        self._after_id = None
+
+    def start(self):
+        """Start reading and pumping chunks into the widget"""
+        threading.Thread(target=self._read, name="file-loader", daemon=True).start()
+        self._after_id = self.text_widget.after(1, self._pump)
+
+    def cancel(self):
+        """Stop loading; text inserted so far stays in the widget"""
+        if self.finished:
+            return
+        self.cancelled = True
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._finish(None)
+
+    def _put(self, item):
+        """Queue an item for the mainloop unless loading was cancelled"""
+        while not self.cancelled:
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _read(self):
+        """Worker thread: decode the file chunk by chunk"""
+        try:
+            if self.encoding is None:
+                self.encoding, self.newline = detect_encoding(self.path, self.candidates)
+            size = os.path.getsize(self.path) or 1
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            digest = hashlib.sha256()
+            done = 0
+            carry = ''
+            with open(self.path, 'rb') as file:
+                while not self.cancelled:
+                    data = file.read(self.chunk_size)
+                    final = not data
+                    done += len(data)
+                    text = carry + decoder.decode(data, final)
+                    # A trailing \r may be the first half of a \r\n pair
+                    carry = ''
+                    if text.endswith('\r') and not final:
+                        carry = '\r'
+                        text = text[:-1]
+                    text = text.replace('\r\n', '\n').replace('\r', '\n')
+                    if text:
+                        digest.update(text.encode('utf-8'))
+                        self._put(('chunk', text, min(1.0, done / size)))
+                    if final:
+                        break
+            self.digest = digest.hexdigest()
+            self._put(('done', None))
+        except Exception as e:
+            self._put(('error', e))
+
+    def _pump(self):
+        """Mainloop: insert queued chunks for a bounded slice of time"""
+        self._after_id = None
+        deadline = time.perf_counter() + self.insert_budget_ms / 1000
+        while not self.cancelled and time.perf_counter() < deadline:
+            try:
+                item = self._chunks.get_nowait()
+            except queue.Empty:
+                break
+
+            if item[0] == 'chunk':
+                _, text, fraction = item
+                self.text_widget.insert('end-1c', text)
+                if self.on_progress:
+                    self.on_progress(fraction)
+                if not self._first_chunk_seen:
+                    self._first_chunk_seen = True
+                    if self.on_first_chunk:
+                        self.on_first_chunk()
+            else:
+                self._finish(item[1])
+                return
+
+        if not self.cancelled:
+            self._after_id = self.text_widget.after(1, self._pump)
+
+    def _finish(self, error):
+        """Report the end of loading exactly once"""
+        if self.finished:
+            return
+        self.finished = True
+        if self.on_done:
+            self.on_done(error, self.cancelled)
@@ -3,13 +3,40 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 
+from file_loader import FileLoader
+from file_saver import FileSaver
+from encoding_detection import DEFAULT_CANDIDATES
+from mapped_viewer import MappedViewer
+from find_in_files import FindInFilesWindow
+from file_search import FileSearch, decode_source
+from file_watcher import changed_line_ranges
+from change_tracker import single_undo_step
+
 
 class FileMenu:
+    MENU_WIDTH = 200
+    MENU_HEIGHT = 370
+    
     def __init__(self, parent):
         """Initialize FileMenu with reference to parent CSERCodeEditor"""
         self.parent = parent
         self.file_menu_frame = None
         self.file_menu_visible = False
+        self.loader = None
+        # Created with the first save; the editor widget does not exist yet
+        self.saver = None
+        self._status_clear_id = None
+        # Encodings tried, in order, on files without a BOM that are not ASCII
+        self.encoding_candidates = DEFAULT_CANDIDATES
+        # (encoding, newline) detected per opened file, reused when saving it
+        self.file_formats = {}
+        # Kept across searches so its cache and worker processes stay warm
+        self.file_search = None
+        self.find_in_files_window = None
+        # (line, start, end) to select once the file being loaded is in
+        self._pending_location = None
+        # Latest bytes per file whose reload prompt is open
+        self._external_changes = {}
         
     def show_file_menu(self):
         """Show the file menu dropdown"""
@@ -17,30 +44,33 @@ class FileMenu:
             self.close_menu()
             return
             
-        # Create menu frame
+        # Create menu frame; CTk widgets take their size in the constructor, not in place()
         self.file_menu_frame = ctk.CTkFrame(
-            self.parent.main_frame,
+            self.parent.root,
+            width=self.MENU_WIDTH,
+            height=self.MENU_HEIGHT,
             fg_color="#2b2b2b",
             border_width=1,
             border_color="#404040",
             corner_radius=8
         )
+        self.file_menu_frame.pack_propagate(False)
         
-        # Position menu below file button
-        button_x = self.parent.file_button.winfo_x()
-        button_y = self.parent.file_button.winfo_y() + self.parent.file_button.winfo_height()
-        
-        self.file_menu_frame.place(x=button_x, y=button_y, width=200, height=300)
+        # Position menu above file button
+        menu_x, menu_y = self._menu_position()
+        self.file_menu_frame.place(x=menu_x, y=menu_y)
         
         # Menu items
         menu_items = [
             ("📄 New File", self._new_file),
             ("📂 Open File", self._open_file),
+            ("👁 View Large File", self._view_file),
             ("💾 Save", self._save_file),
             ("💾 Save As", self._save_as_file),
             ("📋 Copy All", self._copy_all),
             ("📋 Paste", self._paste),
             ("🔍 Find", self._find),
+            ("🔎 Find in Files", self._find_in_files),
             ("🔄 Replace", self._replace),
             ("❌ Exit", self._exit_app)
         ]
@@ -65,28 +95,33 @@ class FileMenu:
         self.file_menu_visible = True
         
         # Bind click outside to close menu
-        self.parent.bind_all("<Button-1>", self._on_click_outside)
+        self.parent.root.bind_all("<Button-1>", self._on_click_outside)
         
         # Update menu position after a short delay
-        self.parent.after(10, self.update_menu_position)
+        self.parent.root.after(10, self.update_menu_position)
         
     def update_menu_position(self):
         """Update menu position to stay aligned with file button"""
         if self.file_menu_frame and self.file_menu_visible:
             try:
-                # Get current button position
-                button_x = self.parent.file_button.winfo_x()
-                button_y = self.parent.file_button.winfo_y() + self.parent.file_button.winfo_height()
-                
                 # Update menu position
-                self.file_menu_frame.place(x=button_x, y=button_y)
+                menu_x, menu_y = self._menu_position()
+                self.file_menu_frame.place(x=menu_x, y=menu_y)
                 
                 # Schedule next update
-                self.parent.after(50, self.update_menu_position)
+                self.parent.root.after(50, self.update_menu_position)
             except:
                 # If there's an error, close the menu
                 self.close_menu()
                 
+    def _menu_position(self):
+        """Top-left corner of the menu in the window, just above the file button at the bottom"""
+        root = self.parent.root
+        button = self.parent.file_button
+        button_x = button.winfo_rootx() - root.winfo_rootx()
+        button_y = button.winfo_rooty() - root.winfo_rooty()
+        return button_x, max(0, button_y - self.MENU_HEIGHT)
+        
     def close_menu(self):
         """Close the file menu"""
         if self.file_menu_frame:
@@ -99,23 +134,23 @@ class FileMenu:
         self.parent.update_file_button_icon(False)
         
         # Unbind click outside event
-        self.parent.unbind_all("<Button-1>")
+        self.parent.root.unbind_all("<Button-1>")
         
     def _on_click_outside(self, event):
         """Handle clicks outside the menu to close it"""
         if self.file_menu_frame and self.file_menu_visible:
-            # Check if click is outside menu
-            menu_x = self.file_menu_frame.winfo_x()
-            menu_y = self.file_menu_frame.winfo_y()
+            # Check if click is outside menu, in screen coordinates
+            menu_x = self.file_menu_frame.winfo_rootx()
+            menu_y = self.file_menu_frame.winfo_rooty()
             menu_width = self.file_menu_frame.winfo_width()
             menu_height = self.file_menu_frame.winfo_height()
             
-            click_x = event.x_root - self.parent.winfo_rootx()
-            click_y = event.y_root - self.parent.winfo_rooty()
+            click_x = event.x_root
+            click_y = event.y_root
             
             # Also check if click is on file button
-            button_x = self.parent.file_button.winfo_x()
-            button_y = self.parent.file_button.winfo_y()
+            button_x = self.parent.file_button.winfo_rootx()
+            button_y = self.parent.file_button.winfo_rooty()
             button_width = self.parent.file_button.winfo_width()
             button_height = self.parent.file_button.winfo_height()
             
@@ -126,18 +161,10 @@ class FileMenu:
                 self.close_menu()
                 
     def _new_file(self):
-        """Create a new file"""
+        """Create a new file in its own tab"""
         self.close_menu()
-        if self.parent.text_editor.get("1.0", "end-1c").strip():
-            result = messagebox.askyesnocancel("New File", "Do you want to save the current file?")
-            if result is True:  # Yes
-                self._save_file()
-            elif result is None:  # Cancel
-                return
-        
-        self.parent.text_editor.delete("1.0", "end")
-        self.parent.current_file = None
-        self.parent.title("CSER Code Editor - Untitled")
+        self._cancel_load()
+        self.parent.buffers.add()
         
     def _open_file(self):
         """Open a file"""
@@ -151,29 +178,119 @@ class FileMenu:
             ]
         )
         
+        if file_path:
+            self._load_file(file_path)
+    
+    def _load_file(self, file_path, location=None):
+        """Stream a file into a tab of its own on a worker thread"""
+        self._cancel_load()
+        existing = self.parent.buffers.find(file_path)
+        if existing is not None:
+            self.parent.switch_buffer(existing)
+            if location is not None:
+                self._select_location(*location)
+            return
+        self._pending_location = location
+        
+        buffer = self.parent.buffers.add_or_reuse()
+        # Streamed chunks are not edits; journaling restarts once the file is in
+        buffer.journal.suspend()
+        self.parent.code_editor.delete("1.0", "end")
+        # The buffer belongs to no file until loading completes
+        self.parent.set_current_file(None)
+        # Highlighting waits until the top of the file is in the widget
+        self.parent.syntax_highlighter.reset()
+        
+        filename = os.path.basename(file_path)
+        self.parent.set_status(f"Loading {filename}...", progress=0.0, cancel_command=self._cancel_load)
+        
+        self.loader = FileLoader(
+            self.parent.code_editor,
+            file_path,
+            on_progress=lambda fraction: self.parent.set_status(
+                f"Loading {filename}... {int(fraction * 100)}%",
+                progress=fraction,
+                cancel_command=self._cancel_load
+            ),
+            on_first_chunk=self.parent.syntax_highlighter.highlight_syntax,
+            on_done=lambda error, cancelled: self._on_load_done(file_path, error, cancelled),
+            candidates=self.encoding_candidates
+        )
+        self.loader.start()
+    
+    def _view_file(self):
+        """Open a huge file read-only in a memory-mapped viewer window"""
+        self.close_menu()
+        file_path = filedialog.askopenfilename(
+            title="View Large File",
+            filetypes=[
+                ("AMX Mod X files", "*.sma *.inc"),
+                ("Log files", "*.log"),
+                ("All files", "*.*")
+            ]
+        )
+        
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    self.parent.text_editor.delete("1.0", "end")
-                    self.parent.text_editor.insert("1.0", content)
-                    self.parent.current_file = file_path
-                    filename = os.path.basename(file_path)
-                    self.parent.title(f"CSER Code Editor - {filename}")
+                MappedViewer(
+                    self.parent.code_editor.winfo_toplevel(),
+                    file_path,
+                    self.parent.custom_font,
+                    self.parent.line_font
+                )
             except Exception as e:
                 messagebox.showerror("Error", f"Could not open file: {str(e)}")
+    
+    def _cancel_load(self):
+        """Stop the file currently being loaded"""
+        if self.loader and not self.loader.finished:
+            self.loader.cancel()
+    
+    def _on_load_done(self, file_path, error, cancelled):
+        """Finish opening a file once the loader stops"""
+        self.parent.clear_status()
+        # Loading is not something to undo
+        self.parent.code_editor.edit_reset()
+        self.parent.syntax_highlighter.highlight_syntax()
+        
+        journal = self.parent.buffers.active.journal
+        if error is not None or cancelled:
+            # Whatever arrived is an unsaved buffer of its own
+            journal.begin(text=self.parent.code_editor.get("1.0", "end-1c"))
+        if error is not None:
+            messagebox.showerror("Error", f"Could not open file: {str(error)}")
+            return
+        if cancelled:
+            self.parent.set_status("Loading cancelled - partial file, not linked to disk")
+            return
+        
+        self.file_formats[file_path] = (self.loader.encoding, self.loader.newline)
+        journal.begin(path=file_path, encoding=self.loader.encoding, digest=self.loader.digest)
+        self.parent.set_current_file(file_path)
+        
+        if self._pending_location is not None:
+            self._select_location(*self._pending_location)
+            self._pending_location = None
+    
+    def _open_location(self, file_path, line, start, end):
+        """Show a match from Find in Files, opening its file if needed"""
+        self._load_file(file_path, location=(line, start, end))
+    
+    def _select_location(self, line, start, end):
+        """Select columns [start, end) of a 0-based line in the editor"""
+        editor = self.parent.code_editor
+        first = f"{line + 1}.{start}"
+        editor.tag_remove("sel", "1.0", "end")
+        editor.tag_add("sel", first, f"{line + 1}.{end}")
+        editor.mark_set("insert", first)
+        editor.see(first)
+        editor.focus_set()
                 
     def _save_file(self):
         """Save the current file"""
         self.close_menu()
         if self.parent.current_file:
-            try:
-                content = self.parent.text_editor.get("1.0", "end-1c")
-                with open(self.parent.current_file, 'w', encoding='utf-8') as file:
-                    file.write(content)
-                messagebox.showinfo("Success", "File saved successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not save file: {str(e)}")
+            self._write_file(self.parent.current_file)
         else:
             self._save_as_file()
             
@@ -191,51 +308,224 @@ class FileMenu:
         )
         
         if file_path:
-            try:
-                content = self.parent.text_editor.get("1.0", "end-1c")
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(content)
-                self.parent.current_file = file_path
-                filename = os.path.basename(file_path)
-                self.parent.title(f"CSER Code Editor - {filename}")
-                messagebox.showinfo("Success", "File saved successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not save file: {str(e)}")
+            # The buffer keeps its encoding and line endings under the new name
+            if self.parent.current_file in self.file_formats:
+                self.file_formats[file_path] = self.file_formats[self.parent.current_file]
+            self.parent.set_current_file(file_path)
+            self._write_file(file_path)
+            
+    def save_buffer(self, buffer):
+        """Save a tab and wait for the write; False if it was cancelled or failed"""
+        if buffer is not self.parent.buffers.active and not buffer.path:
+            # Save As names the buffer on screen
+            self.parent.switch_buffer(buffer)
+        if buffer is self.parent.buffers.active:
+            self._save_file()
+        else:
+            self._write_file(buffer.path, buffer)
+        if self.saver is not None:
+            self.saver.wait()
+        return not buffer.journal.dirty
+                
+    def _write_file(self, file_path, buffer=None):
+        """Hand a buffer to the background saver and report progress in the status bar.
+
+        buffer defaults to the active one; inactive buffers are saved from their stashed text.
+        """
+        if self.saver is None:
+            self.saver = FileSaver(self.parent.code_editor)
+        if buffer is None or buffer is self.parent.buffers.active:
+            buffer = self.parent.buffers.active
+            content = self.parent.code_editor.get("1.0", "end-1c")
+        else:
+            content = buffer.text
+        journal = buffer.journal
+        filename = os.path.basename(file_path)
+        if self._status_clear_id is not None:
+            self.parent.root.after_cancel(self._status_clear_id)
+            self._status_clear_id = None
+        self.parent.set_status(f"Saving {filename}...")
+        checkpoint = journal.checkpoint()
+        encoding, newline = self.file_formats.get(file_path, ('utf-8', None))
+        self.saver.save(
+            file_path,
+            content,
+            encoding=encoding,
+            newline=newline or os.linesep,
+            on_done=lambda status, error: self._on_save_done(journal, file_path, content, checkpoint, encoding, status, error)
+        )
+        
+    def _on_save_done(self, journal, file_path, content, checkpoint, encoding, status, error):
+        """Report the outcome of a background save"""
+        filename = os.path.basename(file_path)
+        if status == 'failed':
+            self.parent.clear_status()
+            if isinstance(error, UnicodeEncodeError):
+                messagebox.showerror("Error", f"Could not save file: the text contains characters that {encoding} cannot store.")
+            else:
+                messagebox.showerror("Error", f"Could not save file: {str(error)}")
+            return
+        # Edits up to the checkpoint are on disk now; the journal keeps the rest
+        journal.saved(file_path, content, checkpoint, encoding)
+        if status == 'unchanged':
+            self.parent.set_status(f"{filename}: no changes")
+        else:
+            self.parent.set_status(f"Saved {filename}")
+        self._status_clear_id = self.parent.root.after(3000, self._clear_save_status)
+        
+    def _clear_save_status(self):
+        """Remove the save notice unless a file load took over the status bar"""
+        self._status_clear_id = None
+        if self.loader is None or self.loader.finished:
+            self.parent.clear_status()
+                
+    def on_file_changed(self, path, data):
+        """Offer to reload an open file that another program changed on disk"""
+        buffer = self.parent.buffers.find(path)
+        if buffer is None or buffer.path is None:
+            return
+        if path in self._external_changes:
+            # The prompt for this file is still open; it will use the newest bytes
+            self._external_changes[path] = data
+            return
+        if data is not None and self.saver is not None and self.saver.wrote(buffer.path, data):
+            return  # Our own save
+        # The file on disk is no longer what this editor last wrote
+        if self.saver is not None:
+            self.saver.forget(buffer.path)
+        
+        if data is None:
+            if self._status_clear_id is not None:
+                self.parent.root.after_cancel(self._status_clear_id)
+            self.parent.set_status(f"{buffer.name} was removed from disk; saving writes it again")
+            self._status_clear_id = self.parent.root.after(5000, self._clear_save_status)
+            return
+        
+        encoding = self.file_formats.get(buffer.path, ('utf-8', None))[0]
+        current = self.parent.code_editor.get("1.0", "end-1c") if buffer is self.parent.buffers.active else buffer.text
+        if decode_source(data, (encoding,) + tuple(self.encoding_candidates)) == current:
+            # Same text as the buffer, e.g. only line endings changed
+            buffer.journal.saved(buffer.path, current, buffer.journal.checkpoint(), encoding)
+            return
+        
+        if buffer.journal.dirty:
+            question = f"{buffer.name} was changed by another program and has unsaved changes here.\n\nReload it and lose your changes?"
+        else:
+            question = f"{buffer.name} was changed by another program.\n\nReload it?"
+        self._external_changes[path] = data
+        try:
+            reload = messagebox.askyesno("File Changed", question)
+        finally:
+            data = self._external_changes.pop(path)
+        # The buffer may have been closed while the prompt was open
+        if reload and data is not None and buffer in self.parent.buffers.buffers:
+            self._reload_buffer(buffer, decode_source(data, (encoding,) + tuple(self.encoding_candidates)), encoding)
+    
+    def _reload_buffer(self, buffer, text, encoding):
+        """Bring a buffer in line with its file, rewriting only the lines that changed.
+
+        In the active buffer the changes are made as one undoable edit, so the
+        cursor stays put outside them and undo can bring the old lines back.
+        """
+        if buffer is self.parent.buffers.active:
+            editor = self.parent.code_editor
+            ranges = changed_line_ranges(editor.get("1.0", "end-1c"), text)
+            line_count = int(editor.index("end-1c").split('.')[0])
+            
+            def apply():
+                # Bottom-up, so the line numbers of earlier ranges stay valid
+                for first, old_end, new_lines in reversed(ranges):
+                    if first < old_end and new_lines:
+                        editor.replace(f"{first + 1}.0", f"{old_end}.end", '\n'.join(new_lines))
+                    elif first < old_end:
+                        # Take the line break of the removed lines along with them
+                        if old_end < line_count:
+                            editor.delete(f"{first + 1}.0", f"{old_end + 1}.0")
+                        else:
+                            editor.delete(f"{first}.end", f"{old_end}.end")
+                    elif first < line_count:
+                        editor.insert(f"{first + 1}.0", '\n'.join(new_lines) + '\n')
+                    else:
+                        editor.insert(f"{first}.end", '\n' + '\n'.join(new_lines))
+            
+            if ranges:
+                single_undo_step(editor, apply)
+        else:
+            buffer.text = text
+            buffer.highlight_cache = None
+            buffer.highlight_cache_bytes = 0
+        # The buffer matches the file again
+        buffer.journal.saved(buffer.path, text, buffer.journal.checkpoint(), encoding)
+        self.parent.set_status(f"Reloaded {buffer.name}")
+        if self._status_clear_id is not None:
+            self.parent.root.after_cancel(self._status_clear_id)
+        self._status_clear_id = self.parent.root.after(3000, self._clear_save_status)
                 
     def _copy_all(self):
         """Copy all text to clipboard"""
         self.close_menu()
-        content = self.parent.text_editor.get("1.0", "end-1c")
-        self.parent.clipboard_clear()
-        self.parent.clipboard_append(content)
+        content = self.parent.code_editor.get("1.0", "end-1c")
+        self.parent.root.clipboard_clear()
+        self.parent.root.clipboard_append(content)
         messagebox.showinfo("Success", "All text copied to clipboard!")
         
     def _paste(self):
         """Paste from clipboard"""
         self.close_menu()
         try:
-            clipboard_content = self.parent.clipboard_get()
-            self.parent.text_editor.insert("insert", clipboard_content)
+            clipboard_content = self.parent.root.clipboard_get()
+            self.parent.code_editor.insert("insert", clipboard_content)
         except:
             messagebox.showwarning("Warning", "Nothing to paste!")
             
     def _find(self):
-        """Find text (placeholder)"""
+        """Open the find bar"""
         self.close_menu()
-        messagebox.showinfo("Find", "Find functionality will be implemented soon!")
+        self.parent.find_bar.show()
+        
+    def _find_in_files(self):
+        """Open the Find in Files panel on the AMX Mod X scripting folder"""
+        self.close_menu()
+        if self.find_in_files_window is not None and self.find_in_files_window.winfo_exists():
+            self.find_in_files_window.focus()
+            return
+        if self.file_search is None:
+            self.file_search = FileSearch()
+        self.find_in_files_window = FindInFilesWindow(
+            self.parent.code_editor.winfo_toplevel(),
+            self.file_search,
+            self.parent.get_scripting_path(),
+            self.parent.custom_font,
+            on_open=self._open_location
+        )
         
     def _replace(self):
-        """Replace text (placeholder)"""
+        """Open the find bar with its replace row"""
         self.close_menu()
-        messagebox.showinfo("Replace", "Replace functionality will be implemented soon!")
+        self.parent.find_bar.show(replace=True)
         
     def _exit_app(self):
         """Exit the application"""
         self.close_menu()
-        if self.parent.text_editor.get("1.0", "end-1c").strip():
-            result = messagebox.askyesnocancel("Exit", "Do you want to save before exiting?")
+        buffers = self.parent.buffers.buffers
+        unsaved = [buffer for buffer in buffers if buffer.journal.dirty]
+        if unsaved:
+            names = ", ".join(buffer.name for buffer in unsaved)
+            result = messagebox.askyesnocancel("Exit", f"Do you want to save {names} before exiting?")
             if result is True:  # Yes
-                self._save_file()
+                for buffer in unsaved:
+                    if not self.save_buffer(buffer):
+                        return
             elif result is None:  # Cancel
                 return
-        self.parent.quit()
\ No newline at end of file
+        if self.file_search is not None:
+            self.file_search.shutdown()
+        self.parent.file_watcher.stop()
+        if self.parent.build is not None:
+            self.parent.build.cancel()
+        # A clean exit leaves nothing to recover
+        for buffer in buffers:
+            buffer.journal.close()
+        for buffer in buffers:
+            buffer.journal.wait()
+        self.parent.root.quit()
\ No newline at end of file
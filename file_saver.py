@@ -0,0 +1,102 @@
+import hashlib
+import os
+import queue
+import shutil
+import tempfile
+import threading
+
+
+def atomic_write(path, data):
+    """Write bytes to a temp file next to path, fsync it and rename it over path"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class FileSaver:
+    """Save buffers on a worker thread, skipping writes whose content is unchanged"""
+
+    def __init__(self, widget):
+        # Widget whose after() delivers completion callbacks on the mainloop
+        self.widget = widget
+        self.poll_ms = 20
+        # Content digest of the last write per path
+        self._digests = {}
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = None
+        self._poll_id = None
+
+    def save(self, path, content, encoding='utf-8', newline=os.linesep, on_done=None):
+        """Queue a save; on_done(status, error) runs on the mainloop afterwards.
+
+        status is 'saved', 'unchanged' or 'failed'.
+        """
+        self._jobs.put((path, content, encoding, newline, on_done))
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name="file-saver", daemon=True)
+            self._worker.start()
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def forget(self, path):
+        """Drop the remembered digest, e.g. when the file changed on disk"""
+        self._digests.pop(path, None)
+
+    def wrote(self, path, data):
+        """Whether data is exactly what the last save to path wrote"""
+        return self._digests.get(path) == hashlib.sha256(data).digest()
+
+    def wait(self):
+        """Block until every queued save has been written"""
+        self._jobs.join()
+        self._poll()
+
+    def _work(self):
+        """Worker thread: saves run one at a time in the order they were queued"""
+        while True:
+            path, content, encoding, newline, on_done = self._jobs.get()
+            try:
+                data = content.replace('\n', newline).encode(encoding)
+                digest = hashlib.sha256(data).digest()
+                if self._digests.get(path) == digest and os.path.exists(path):
+                    status = 'unchanged'
+                else:
+                    atomic_write(path, data)
+                    self._digests[path] = digest
+                    status = 'saved'
+                self._results.put((on_done, status, None))
+            except Exception as e:
+                self._results.put((on_done, 'failed', e))
+            finally:
+                self._jobs.task_done()
+
+    def _poll(self):
+        """Mainloop: report finished saves"""
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        # Read before draining: once nothing is unfinished every result is queued
+        unfinished = self._jobs.unfinished_tasks
+        while True:
+            try:
+                on_done, status, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if on_done:
+                on_done(status, error)
+        if unfinished:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
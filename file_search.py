@@ -0,0 +1,235 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from encoding_detection import DEFAULT_CANDIDATES
+from find_index import MatchIndex, compile_search
+
+
+SEARCH_EXTENSIONS = ('.sma', '.inc', '.sp')
+# Longest line text kept per result
+PREVIEW_LENGTH = 200
+
+
+def decode_source(data, candidates=DEFAULT_CANDIDATES):
+    """Decode file bytes with the first candidate that fits, newlines normalized"""
+    for encoding in candidates:
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        text = data.decode('latin-1')
+    if text.startswith('\ufeff'):
+        text = text[1:]
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _literal_spans(text, query, pattern, match_case):
+    """Spans of a Text/Word query, found with str.find and confirmed by the pattern.
+
+    The regex engine has no fast path for a leading \\b or for IGNORECASE, so
+    candidates come from a plain substring search and only those are matched.
+    Returns None when lowercasing changes the text length and offsets would
+    no longer line up.
+    """
+    if match_case:
+        haystack, needle = text, query
+    else:
+        haystack, needle = text.lower(), query.lower()
+        if len(haystack) != len(text):
+            return None
+    spans = []
+    position = haystack.find(needle)
+    while position >= 0:
+        match = pattern.match(text, position)
+        if match is not None and match.end() > position:
+            spans.append(match.span())
+            position = haystack.find(needle, match.end())
+        else:
+            position = haystack.find(needle, position + 1)
+    return spans
+
+
+def find_matches(text, query, mode, match_case):
+    """(line, start, end, preview) for every match in text, lines 0-based.
+
+    Line numbers are counted between matches with str.count, so the cost
+    follows the number of matches rather than the number of lines.
+    """
+    pattern = compile_search(query, mode, match_case)
+    spans = None
+    if mode != 'regex' and (match_case or query.isascii()):
+        spans = _literal_spans(text, query, pattern, match_case)
+    if spans is None:
+        spans = [match.span() for match in pattern.finditer(text) if match.end() > match.start()]
+
+    results = []
+    line = 0
+    position = 0
+    for start, end in spans:
+        if text.find('\n', start, end) >= 0:
+            # Matches never span lines; let MatchIndex rescan line by line
+            return _find_matches_by_line(text, pattern)
+        line += text.count('\n', position, start)
+        position = start
+        line_start = text.rfind('\n', 0, start) + 1
+        line_end = text.find('\n', end)
+        if line_end < 0:
+            line_end = len(text)
+        results.append((line, start - line_start, end - line_start, text[line_start:line_end][:PREVIEW_LENGTH]))
+    return results
+
+
+def _find_matches_by_line(text, pattern):
+    index = MatchIndex(pattern)
+    index.scan(text)
+    lines = text.split('\n')
+    results = []
+    for line, spans in enumerate(index.line_matches):
+        for start, end in spans:
+            results.append((line, start, end, lines[line][:PREVIEW_LENGTH]))
+    return results
+
+
+def search_file(path, query, mode, match_case, candidates=DEFAULT_CANDIDATES):
+    """Process pool task: read, decode and search one file; returns (text, matches)"""
+    with open(path, 'rb') as file:
+        text = decode_source(file.read(), candidates)
+    return text, find_matches(text, query, mode, match_case)
+
+
+def iter_source_files(root, extensions=SEARCH_EXTENSIONS):
+    """Yield (path, mtime_ns, size) for every source file below root"""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda entry: entry.name.lower()):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.lower().endswith(extensions):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_mtime_ns, stat.st_size
+            except OSError:
+                continue
+
+
+class FileSearch:
+    """Search a source tree with a process pool, streaming results per file.
+
+    Decoded file text is cached by (mtime, size), so a repeat search only
+    sends changed files to the pool and scans the rest in-process.
+    """
+
+    def __init__(self, max_workers=None, cache_bytes=64 * 1024 * 1024):
+        self.max_workers = max_workers
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        self._cache_lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._generation = 0
+        # ('file', generation, path, matches), ('error', generation, path, error)
+        # and ('done', generation, files, cached) for the mainloop
+        self.results = queue.Queue()
+
+    def start(self, root, query, mode='text', match_case=False, candidates=DEFAULT_CANDIDATES):
+        """Start a search, superseding any running one; returns its generation.
+
+        Raises re.error for an invalid regex before anything runs.
+        """
+        compile_search(query, mode, match_case)
+        self._generation += 1
+        generation = self._generation
+        threading.Thread(
+            target=self._run,
+            args=(generation, root, query, mode, match_case, candidates),
+            name="find-in-files",
+            daemon=True
+        ).start()
+        return generation
+
+    def cancel(self):
+        """Stop the running search; its remaining results are dropped"""
+        self._generation += 1
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self.cancel()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _cached_text(self, path, mtime, size):
+        with self._cache_lock:
+            entry = self._cache.get(path)
+            if entry is None or entry[:2] != (mtime, size):
+                return None
+            self._cache.move_to_end(path)
+            return entry[2]
+
+    def _store(self, path, mtime, size, text):
+        """Cache decoded text, evicting least recently used files over the budget"""
+        with self._cache_lock:
+            old = self._cache.pop(path, None)
+            if old is not None:
+                self._cache_size -= len(old[2])
+            if len(text) > self.cache_bytes:
+                return
+            self._cache[path] = (mtime, size, text)
+            self._cache_size += len(text)
+            while self._cache_size > self.cache_bytes:
+                _, (_, _, evicted) = self._cache.popitem(last=False)
+                self._cache_size -= len(evicted)
+
+    def _run(self, generation, root, query, mode, match_case, candidates):
+        """Coordinator thread: scan cached files here, send the rest to the pool"""
+        files = 0
+        cached = 0
+        futures = {}
+        try:
+            for path, mtime, size in iter_source_files(root):
+                if generation != self._generation:
+                    break
+                files += 1
+                text = self._cached_text(path, mtime, size)
+                if text is not None:
+                    cached += 1
+                    matches = find_matches(text, query, mode, match_case)
+                    if matches:
+                        self.results.put(('file', generation, path, matches))
+                    continue
+                with self._pool_lock:
+                    if self._pool is None:
+                        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                    pool = self._pool
+                future = pool.submit(search_file, path, query, mode, match_case, candidates)
+                futures[future] = (path, mtime, size)
+
+            for future in as_completed(futures):
+                if generation != self._generation:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                path, mtime, size = futures[future]
+                try:
+                    text, matches = future.result()
+                except Exception as e:
+                    self.results.put(('error', generation, path, e))
+                    continue
+                self._store(path, mtime, size, text)
+                if matches:
+                    self.results.put(('file', generation, path, matches))
+        except Exception as e:
+            self.results.put(('error', generation, root, e))
+        self.results.put(('done', generation, files, cached))
@@ -0,0 +1,232 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+from difflib import SequenceMatcher
+
+
+# inotify(7) event bits
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# Finished writes, atomic replaces and removals; plain IN_MODIFY would fire per write() call
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# struct inotify_event without its trailing name
+_EVENT = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """libc with the inotify calls, or None where inotify is not available"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def _stat(path):
+    """(mtime_ns, size) of a file, or None if it is gone"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def changed_line_ranges(old_text, new_text):
+    """Line ranges that differ between two texts, as (first, old_end, new_lines).
+
+    Old lines [first, old_end) (0-based) are to be replaced by new_lines.
+    Ranges come in ascending order and never overlap, so applying them from
+    the last to the first keeps the earlier line numbers valid. The common
+    head and tail are skipped before the lines in between are diffed.
+    """
+    old_lines = old_text.split('\n')
+    new_lines = new_text.split('\n')
+    head = 0
+    limit = min(len(old_lines), len(new_lines))
+    while head < limit and old_lines[head] == new_lines[head]:
+        head += 1
+    tail = 0
+    limit -= head
+    while tail < limit and old_lines[-1 - tail] == new_lines[-1 - tail]:
+        tail += 1
+
+    old_middle = old_lines[head:len(old_lines) - tail]
+    new_middle = new_lines[head:len(new_lines) - tail]
+    ranges = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_middle, new_middle).get_opcodes():
+        if tag != 'equal':
+            ranges.append((head + i1, head + i2, new_middle[j1:j2]))
+    return ranges
+
+
+class FileWatcher:
+    """Notice when watched files are changed on disk by another program.
+
+    Uses inotify on the files' directories where it is available, and
+    otherwise stats every watched file in one batch per poll_interval on a
+    worker thread. Either way (mtime, size) is cached per file and a change
+    is only reported once it differs; the file is then read on the worker so
+    on_change(path, data) gets its bytes on the mainloop, or None for data
+    when the file is gone.
+    """
+
+    def __init__(self, widget, on_change, poll_interval=1.0):
+        # Widget whose after() delivers changes on the mainloop
+        self.widget = widget
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.poll_ms = 250
+        # Time to let a burst of inotify events (e.g. write, then rename) arrive
+        self.settle = 0.1
+
+        # Absolute path -> cached (mtime_ns, size), or None while missing
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._changes = queue.Queue()
+        self._stopped = threading.Event()
+        self._worker = None
+        self._poll_id = None
+
+        self._libc = _load_inotify()
+        self._fd = None
+        # Directory -> watch descriptor and back
+        self._directories = {}
+        self._directory_of = {}
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+
+    @property
+    def uses_inotify(self):
+        return self._fd is not None
+
+    def set_paths(self, paths):
+        """Watch exactly these files; new ones are taken as they are on disk now"""
+        wanted = {os.path.abspath(path) for path in paths}
+        with self._lock:
+            for path in list(self._stats):
+                if path not in wanted:
+                    del self._stats[path]
+            for path in wanted:
+                if path not in self._stats:
+                    self._stats[path] = _stat(path)
+            directories = {os.path.dirname(path) for path in self._stats}
+        if self._fd is not None:
+            self._update_directory_watches(directories)
+        if self._stats and self._worker is None:
+            target = self._read_events if self._fd is not None else self._poll_stats
+            self._worker = threading.Thread(target=target, name="file-watcher", daemon=True)
+            self._worker.start()
+        if self._poll_id is None and self._worker is not None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def stop(self):
+        """Stop watching; the worker closes the inotify descriptor on its way out"""
+        self._stopped.set()
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._worker is None and self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _update_directory_watches(self, directories):
+        for directory in list(self._directories):
+            if directory not in directories:
+                self._libc.inotify_rm_watch(self._fd, self._directories.pop(directory))
+        for directory in directories:
+            if directory in self._directories:
+                continue
+            descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if descriptor >= 0:
+                self._directories[directory] = descriptor
+                self._directory_of[descriptor] = directory
+
+    def _read_events(self):
+        """Worker thread: turn inotify events into stat checks of the watched files they name"""
+        try:
+            while not self._stopped.is_set():
+                ready, _, _ = select.select([self._fd], [], [], 1.0)
+                if not ready:
+                    continue
+                self._stopped.wait(self.settle)
+                paths = set()
+                while True:
+                    try:
+                        data = os.read(self._fd, 64 * 1024)
+                    except BlockingIOError:
+                        break
+                    offset = 0
+                    while offset < len(data):
+                        descriptor, _, _, length = _EVENT.unpack_from(data, offset)
+                        name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                        offset += _EVENT.size + length
+                        directory = self._directory_of.get(descriptor)
+                        if directory is not None and name:
+                            paths.add(os.path.join(directory, os.fsdecode(name)))
+                self._check(paths)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def _poll_stats(self):
+        """Worker thread: stat every watched file once per interval"""
+        while not self._stopped.wait(self.poll_interval):
+            with self._lock:
+                paths = list(self._stats)
+            self._check(paths)
+
+    def _check(self, paths):
+        """Compare paths against their cached stat and queue the ones that changed"""
+        for path in paths:
+            with self._lock:
+                if path not in self._stats:
+                    continue
+                cached = self._stats[path]
+            current = _stat(path)
+            if current == cached:
+                continue
+            data = None
+            if current is not None:
+                try:
+                    with open(path, 'rb') as file:
+                        data = file.read()
+                except OSError:
+                    # Still being written or locked; the next event or poll retries
+                    continue
+            with self._lock:
+                if path not in self._stats:
+                    continue
+                self._stats[path] = current
+            self._changes.put((path, data))
+
+    def _poll(self):
+        """Mainloop: report changes found by the worker"""
+        self._poll_id = None
+        if self._stopped.is_set():
+            return
+        # Rescheduled first: on_change may wait in a dialog's event loop
+        self._poll_id = self.widget.after(self.poll_ms, self._poll)
+        while True:
+            try:
+                path, data = self._changes.get_nowait()
+            except queue.Empty:
+                break
+            self.on_change(path, data)
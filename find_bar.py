@@ -0,0 +1,277 @@
+import re
+
+import customtkinter as ctk
+import tkinter as tk
+
+from change_tracker import single_undo_step
+from find_index import MatchIndex, compile_search
+
+
+class FindBar(ctk.CTkFrame):
+    """Find and replace bar that highlights every match in a text widget as you type.
+
+    The match index is rebuilt only when the query changes; edits reported
+    through note_edit rescan just the lines they touched.
+    """
+
+    MODES = {"Text": 'text', "Word": 'word', "Regex": 'regex'}
+
+    def __init__(self, master, text_widget, **kwargs):
+        super().__init__(master, corner_radius=8, **kwargs)
+        self.text_widget = text_widget
+        self.index = None
+        self.pattern = None
+        self.visible = False
+        self.replace_visible = False
+
+        self.grid_columnconfigure(0, weight=1)
+
+        self.query_var = tk.StringVar()
+        self.entry = ctk.CTkEntry(self, textvariable=self.query_var, placeholder_text="Find...", height=30)
+        self.entry.grid(row=0, column=0, sticky="ew", padx=(8, 4), pady=6)
+
+        self.mode_button = ctk.CTkSegmentedButton(self, values=list(self.MODES), command=lambda value: self.refresh())
+        self.mode_button.set("Text")
+        self.mode_button.grid(row=0, column=1, padx=4)
+
+        self.case_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(self, text="Match case", variable=self.case_var, width=100,
+                        command=self.refresh).grid(row=0, column=2, padx=4)
+
+        self.count_label = ctk.CTkLabel(self, text="", width=110, font=ctk.CTkFont(size=12),
+                                        text_color=("#7C7C7C", "#A0A0A0"))
+        self.count_label.grid(row=0, column=3, padx=4)
+
+        ctk.CTkButton(self, text="◀", width=32, height=28, command=self.find_previous).grid(row=0, column=4, padx=2)
+        ctk.CTkButton(self, text="▶", width=32, height=28, command=self.find_next).grid(row=0, column=5, padx=2)
+        ctk.CTkButton(self, text="✕", width=32, height=28, fg_color="transparent",
+                      hover_color="#404040", command=self.hide).grid(row=0, column=6, padx=(2, 8))
+
+        # Replace row, shown by show(replace=True)
+        self.replace_var = tk.StringVar()
+        self.replace_entry = ctk.CTkEntry(self, textvariable=self.replace_var,
+                                          placeholder_text="Replace with... (\\1, \\g<name> in Regex mode)", height=30)
+        self.replace_button = ctk.CTkButton(self, text="Replace", width=90, height=28, command=self.replace)
+        self.replace_all_button = ctk.CTkButton(self, text="Replace All", width=100, height=28, command=self.replace_all)
+        self.replace_entry.bind('<Return>', lambda event: self.replace())
+        self.replace_entry.bind('<Control-Return>', lambda event: self.replace_all())
+        self.replace_entry.bind('<Escape>', lambda event: self.hide())
+
+        self.text_widget.tag_configure('find_match', background='#613214')
+        self.text_widget.tag_configure('find_current', background='#515c6a')
+        self.text_widget.tag_raise('sel')
+
+        self.query_var.trace_add('write', lambda *args: self.refresh())
+        self.entry.bind('<Return>', lambda event: self.find_next())
+        self.entry.bind('<Shift-Return>', lambda event: self.find_previous())
+        self.entry.bind('<Escape>', lambda event: self.hide())
+
+    def show(self, row=3, replace=False):
+        """Show the bar below the editor and focus the query"""
+        if not self.visible:
+            self.grid(row=row, column=0, sticky="ew", padx=15, pady=(0, 10))
+            self.visible = True
+        if replace and not self.replace_visible:
+            self.replace_entry.grid(row=1, column=0, sticky="ew", padx=(8, 4), pady=(0, 6))
+            self.replace_button.grid(row=1, column=1, sticky="w", padx=4, pady=(0, 6))
+            self.replace_all_button.grid(row=1, column=2, columnspan=2, sticky="w", padx=4, pady=(0, 6))
+            self.replace_visible = True
+        elif not replace and self.replace_visible:
+            for widget in (self.replace_entry, self.replace_button, self.replace_all_button):
+                widget.grid_remove()
+            self.replace_visible = False
+        # Start from the selection, as editors usually do
+        try:
+            selected = self.text_widget.get('sel.first', 'sel.last')
+        except tk.TclError:
+            selected = ''
+        if selected and '\n' not in selected and selected != self.query_var.get():
+            # Setting the query refreshes through the variable trace
+            self.query_var.set(selected)
+        else:
+            self.refresh()
+        self.entry.focus_set()
+        self.entry.select_range(0, 'end')
+
+    def hide(self):
+        """Hide the bar and drop the match index"""
+        if self.visible:
+            self.grid_remove()
+            self.visible = False
+        self.index = None
+        self.pattern = None
+        self.text_widget.tag_remove('find_match', '1.0', 'end')
+        self.text_widget.tag_remove('find_current', '1.0', 'end')
+        self.text_widget.focus_set()
+
+    def refresh(self):
+        """Rebuild the index for the current query and jump to the nearest match"""
+        self.text_widget.tag_remove('find_match', '1.0', 'end')
+        self.text_widget.tag_remove('find_current', '1.0', 'end')
+        self.index = None
+        self.pattern = None
+
+        query = self.query_var.get()
+        if not self.visible or not query:
+            self.count_label.configure(text="")
+            return
+        try:
+            pattern = compile_search(query, self.MODES[self.mode_button.get()], self.case_var.get())
+        except re.error:
+            self.count_label.configure(text="Invalid regex")
+            return
+
+        self.pattern = pattern
+        self.index = MatchIndex(pattern)
+        self.index.scan(self.text_widget.get('1.0', 'end-1c'))
+        self._tag_lines(0, len(self.index.line_matches))
+
+        # Search as you type: stay on a match that starts at the cursor
+        line, column = self._insert_position()
+        self._select(self.index.next_match(line, column - 1))
+
+    def note_edit(self, first, old_end, new_end):
+        """Rescan the edited lines: old lines [first, old_end) are now [first, new_end)"""
+        if self.index is None:
+            return
+        new_lines = self.text_widget.get(f"{first + 1}.0", f"{new_end}.end").split('\n')
+        self.index.update(first, old_end, new_lines)
+        self.text_widget.tag_remove('find_match', f"{first + 1}.0", f"{new_end}.end")
+        self._tag_lines(first, new_end)
+        self._update_count()
+
+    def find_next(self):
+        self._step(backwards=False)
+
+    def find_previous(self):
+        self._step(backwards=True)
+
+    def _step(self, backwards):
+        if self.index is None:
+            if not self.visible:
+                self.show()
+            return
+        line, column = self._insert_position()
+        self._select(self.index.next_match(line, column, backwards))
+
+    def _expand(self, match):
+        """Replacement text for a match; groups are only expanded in Regex mode"""
+        if self.MODES[self.mode_button.get()] == 'regex':
+            return match.expand(self.replace_var.get())
+        return self.replace_var.get()
+
+    def replace(self):
+        """Replace the current match and move on to the next one"""
+        if self.index is None:
+            return
+        current = self.text_widget.tag_nextrange('find_current', '1.0')
+        if not current:
+            self.find_next()
+            return
+
+        line_number, start = (int(part) for part in current[0].split('.'))
+        line = self.text_widget.get(f"{line_number}.0", f"{line_number}.end")
+        match = self.pattern.search(line, start)
+        if match is None or match.start() != start:
+            self.find_next()
+            return
+        try:
+            replacement = self._expand(match)
+        except (re.error, IndexError) as e:
+            self.count_label.configure(text=f"Bad replacement: {e}")
+            return
+
+        single_undo_step(self.text_widget, lambda: self.text_widget.replace(current[0], current[1], replacement))
+        # Continue after the inserted text so it is never matched again; a
+        # match starting right there is the next one, as in refresh()
+        self.text_widget.mark_set('insert', f"{current[0]}+{len(replacement)}c")
+        line, column = self._insert_position()
+        self._select(self.index.next_match(line, column - 1))
+
+    def replace_all(self):
+        """Replace every match in one edit that a single undo reverts.
+
+        The replacements are computed on a snapshot of the lines that have
+        matches, then the span from the first to the last such line is
+        swapped in with one replace call, so the change tracker, the journal
+        and the highlighter each see one edit however many matches there are.
+        """
+        if self.index is None or not self.index.count:
+            return
+        line_matches = self.index.line_matches
+        affected = [i for i, spans in enumerate(line_matches) if spans]
+        first, last = affected[0], affected[-1]
+
+        lines = self.text_widget.get(f"{first + 1}.0", f"{last + 1}.end").split('\n')
+
+        # Only the indexed matches are replaced; like the count shown, they
+        # leave out the empty matches a pattern such as x* also finds
+        count = 0
+        try:
+            for i in affected:
+                line = lines[i - first]
+                pieces = []
+                position = 0
+                for start, end in line_matches[i]:
+                    match = self.pattern.match(line, start)
+                    if match is None or match.end() != end:
+                        continue
+                    pieces.append(line[position:start])
+                    pieces.append(self._expand(match))
+                    position = end
+                    count += 1
+                pieces.append(line[position:])
+                lines[i - first] = ''.join(pieces)
+        except (re.error, IndexError) as e:
+            self.count_label.configure(text=f"Bad replacement: {e}")
+            return
+
+        insert = self.text_widget.index('insert')
+        single_undo_step(self.text_widget, lambda: self.text_widget.replace(
+            f"{first + 1}.0", f"{last + 1}.end", '\n'.join(lines)))
+        self.text_widget.mark_set('insert', insert)
+        self.text_widget.tag_remove('find_current', '1.0', 'end')
+        self.count_label.configure(text=f"Replaced {count}")
+
+    def _insert_position(self):
+        line, column = self.text_widget.index('insert').split('.')
+        return int(line) - 1, int(column)
+
+    def _tag_lines(self, first, last):
+        """Tag the matches on lines [first, last) with one tag_add call"""
+        ranges = []
+        for line in range(first, last):
+            for start, end in self.index.line_matches[line]:
+                ranges.append(f"{line + 1}.{start}")
+                ranges.append(f"{line + 1}.{end}")
+        if ranges:
+            self.text_widget.tag_add('find_match', *ranges)
+
+    def _select(self, match):
+        """Make a match current: select it, put the cursor on it and scroll to it"""
+        self.text_widget.tag_remove('find_current', '1.0', 'end')
+        if match is None:
+            self._update_count()
+            return
+        line, start, end = match
+        first = f"{line + 1}.{start}"
+        last = f"{line + 1}.{end}"
+        self.text_widget.tag_add('find_current', first, last)
+        self.text_widget.tag_remove('sel', '1.0', 'end')
+        self.text_widget.tag_add('sel', first, last)
+        self.text_widget.mark_set('insert', first)
+        self.text_widget.see(first)
+        self._update_count(line, start)
+
+    def _update_count(self, line=None, start=None):
+        """Show 'n of total' for the match at (line, start), otherwise just the total"""
+        if self.index is None:
+            return
+        if not self.index.count:
+            self.count_label.configure(text="No results")
+            return
+        ordinal = self.index.ordinal(line, start) if line is not None else None
+        if ordinal is None:
+            self.count_label.configure(text=f"{self.index.count} results")
+        else:
+            self.count_label.configure(text=f"{ordinal} of {self.index.count}")
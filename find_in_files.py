@@ -0,0 +1,220 @@
+import os
+import queue
+import re
+import time
+
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import filedialog
+
+
+class FindInFilesWindow(ctk.CTkToplevel):
+    """Find-in-Files panel listing matches below a root folder as each file completes"""
+
+    MODES = {"Text": 'text', "Word": 'word', "Regex": 'regex'}
+
+    def __init__(self, master, file_search, root, font, on_open=None):
+        super().__init__(master)
+        self.title("Find in Files")
+        self.geometry("900x600")
+        self.file_search = file_search
+        # on_open(path, line, start, end) with a 0-based line
+        self.on_open = on_open
+
+        self.poll_ms = 30
+        # Time spent inserting results per mainloop iteration
+        self.insert_budget_ms = 12
+        # Result rows shown in total and per file; the count covers all of them
+        self.max_rows = 5000
+        self.max_rows_per_file = 200
+
+        self._generation = None
+        self._poll_id = None
+        self._started = 0.0
+        self._match_count = 0
+        self._file_count = 0
+        self._rows = 0
+        # Text widget line -> (path, line, start, end)
+        self._locations = {}
+
+        self._create_widgets(root, font)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    def _create_widgets(self, root, font):
+        self.grid_rowconfigure(2, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        folder_frame = ctk.CTkFrame(self, corner_radius=8)
+        folder_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
+        folder_frame.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(folder_frame, text="Folder:", font=ctk.CTkFont(size=13, weight="bold")).grid(row=0, column=0, padx=(10, 6), pady=6)
+        self.root_entry = ctk.CTkEntry(folder_frame, height=30)
+        self.root_entry.grid(row=0, column=1, sticky="ew", padx=4, pady=6)
+        self.root_entry.insert(0, root)
+        ctk.CTkButton(folder_frame, text="Browse", width=80, height=28, command=self.browse_root).grid(row=0, column=2, padx=(4, 10))
+
+        query_frame = ctk.CTkFrame(self, corner_radius=8)
+        query_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=5)
+        query_frame.grid_columnconfigure(0, weight=1)
+        self.query_entry = ctk.CTkEntry(query_frame, placeholder_text="Find in files...", height=30)
+        self.query_entry.grid(row=0, column=0, sticky="ew", padx=(8, 4), pady=6)
+        self.query_entry.bind('<Return>', lambda event: self.search())
+
+        self.mode_button = ctk.CTkSegmentedButton(query_frame, values=list(self.MODES))
+        self.mode_button.set("Word")
+        self.mode_button.grid(row=0, column=1, padx=4)
+        self.case_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(query_frame, text="Match case", variable=self.case_var, width=100).grid(row=0, column=2, padx=4)
+        self.search_button = ctk.CTkButton(query_frame, text="Search", width=90, height=28, command=self.search)
+        self.search_button.grid(row=0, column=3, padx=(4, 10))
+
+        results_frame = ctk.CTkFrame(self, corner_radius=8)
+        results_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
+        results_frame.grid_rowconfigure(0, weight=1)
+        results_frame.grid_columnconfigure(0, weight=1)
+        self.results_text = tk.Text(
+            results_frame,
+            wrap=tk.NONE,
+            font=font,
+            bg='#1e1e1e',
+            fg='#d4d4d4',
+            selectbackground='#264f78',
+            relief='flat',
+            borderwidth=0,
+            padx=8,
+            pady=8,
+            state='disabled',
+            cursor='arrow'
+        )
+        self.results_text.tag_configure('file', foreground='#569cd6')
+        self.results_text.tag_configure('location', foreground='#858585')
+        self.results_text.tag_configure('match', background='#613214')
+        self.results_text.tag_configure('note', foreground='#858585')
+        self.results_text.bind('<Double-Button-1>', self.on_double_click)
+        v_scrollbar = ctk.CTkScrollbar(results_frame, command=self.results_text.yview)
+        self.results_text.configure(yscrollcommand=v_scrollbar.set)
+        self.results_text.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        v_scrollbar.grid(row=0, column=1, sticky="ns", padx=5, pady=5)
+
+        self.status_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=12),
+                                         text_color=("#7C7C7C", "#A0A0A0"))
+        self.status_label.grid(row=3, column=0, sticky="w", padx=15, pady=(0, 8))
+
+        self.query_entry.focus_set()
+
+    def browse_root(self):
+        folder_path = filedialog.askdirectory(title="Search folder", initialdir=self.root_entry.get() or None)
+        if folder_path:
+            self.root_entry.delete(0, 'end')
+            self.root_entry.insert(0, folder_path)
+
+    def search(self):
+        """Start a search, or stop the running one"""
+        if self._generation is not None:
+            self.stop()
+            return
+        query = self.query_entry.get()
+        root = self.root_entry.get().strip()
+        if not query:
+            return
+        if not os.path.isdir(root):
+            self.status_label.configure(text=f"Folder not found: {root}")
+            return
+        try:
+            generation = self.file_search.start(root, query, self.MODES[self.mode_button.get()], self.case_var.get())
+        except re.error as e:
+            self.status_label.configure(text=f"Invalid regex: {e}")
+            return
+
+        self.results_text.configure(state='normal')
+        self.results_text.delete('1.0', 'end')
+        self.results_text.configure(state='disabled')
+        self._locations = {}
+        self._match_count = 0
+        self._file_count = 0
+        self._rows = 0
+        self._generation = generation
+        self._started = time.perf_counter()
+        self.search_button.configure(text="Stop")
+        self.status_label.configure(text="Searching...")
+        if self._poll_id is None:
+            self._poll_id = self.after(self.poll_ms, self._poll)
+
+    def stop(self):
+        """Cancel the running search, keeping what was found so far"""
+        self.file_search.cancel()
+        self._finish(f"Stopped: {self._match_count} matches in {self._file_count} files")
+
+    def close(self):
+        if self._generation is not None:
+            self.file_search.cancel()
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.destroy()
+
+    def _finish(self, status):
+        self._generation = None
+        self.search_button.configure(text="Search")
+        self.status_label.configure(text=status)
+
+    def _poll(self):
+        """Mainloop: append results streamed by the search for a bounded slice of time"""
+        self._poll_id = None
+        deadline = time.perf_counter() + self.insert_budget_ms / 1000
+        while self._generation is not None and time.perf_counter() < deadline:
+            try:
+                item = self.file_search.results.get_nowait()
+            except queue.Empty:
+                break
+            if item[1] != self._generation:
+                continue
+            if item[0] == 'file':
+                self._add_file(item[2], item[3])
+            elif item[0] == 'error':
+                self._add_note(f"{item[2]}: {item[3]}\n")
+            else:
+                _, _, files, cached = item
+                elapsed = time.perf_counter() - self._started
+                self._finish(f"{self._match_count} matches in {self._file_count} of {files} files "
+                             f"({cached} cached) - {elapsed:.2f}s")
+
+        if self._generation is not None:
+            self.status_label.configure(text=f"Searching... {self._match_count} matches in {self._file_count} files")
+            self._poll_id = self.after(self.poll_ms, self._poll)
+
+    def _add_note(self, text):
+        self.results_text.configure(state='normal')
+        self.results_text.insert('end', text, 'note')
+        self.results_text.configure(state='disabled')
+
+    def _add_file(self, path, matches):
+        """Append one file's matches, clipped to the row limits"""
+        self._file_count += 1
+        self._match_count += len(matches)
+        if self._rows >= self.max_rows:
+            return
+
+        root = self.root_entry.get().strip()
+        text = self.results_text
+        text.configure(state='normal')
+        text.insert('end', f"{os.path.relpath(path, root)} ({len(matches)})\n", 'file')
+        shown = matches[:min(self.max_rows_per_file, self.max_rows - self._rows)]
+        for line, start, end, preview in shown:
+            location = f"  {line + 1}: "
+            row = int(text.index('end-1c').split('.')[0])
+            text.insert('end', location, 'location', preview + '\n')
+            if end <= len(preview):
+                text.tag_add('match', f"{row}.{len(location) + start}", f"{row}.{len(location) + end}")
+            self._locations[row] = (path, line, start, end)
+        self._rows += len(shown) + 1
+        if len(shown) < len(matches):
+            text.insert('end', f"  ... {len(matches) - len(shown)} more\n", 'note')
+        text.configure(state='disabled')
+
+    def on_double_click(self, event):
+        row = int(self.results_text.index(f"@{event.x},{event.y}").split('.')[0])
+        location = self._locations.get(row)
+        if location and self.on_open:
+            self.on_open(*location)
+        return 'break'
@@ -0,0 +1,103 @@
+import re
+from bisect import bisect_right
+
+from pawn_lexer import line_offsets
+
+
+SEARCH_MODES = ('text', 'word', 'regex')
+
+
+def compile_search(text, mode='text', match_case=False):
+    """Compile a Find query; mode is 'text', 'word' or 'regex'.
+
+    Raises re.error for an invalid regex.
+    """
+    pattern = text if mode == 'regex' else re.escape(text)
+    if mode == 'word':
+        pattern = rf'\b{pattern}\b'
+    flags = re.MULTILINE | (0 if match_case else re.IGNORECASE)
+    return re.compile(pattern, flags)
+
+
+class MatchIndex:
+    """Matches of a pattern per line, kept current from exact edit ranges.
+
+    Matches never span lines. line_matches[i] holds the (start, end) columns
+    of the matches on 0-based line i.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.line_matches = []
+        self.count = 0
+
+    def _scan_line(self, line):
+        """Non-empty matches on one line"""
+        return tuple(match.span() for match in self.pattern.finditer(line) if match.end() > match.start())
+
+    def scan(self, text):
+        """Index every line of text; one pass of the regex over the whole buffer"""
+        offsets = line_offsets(text)
+        lines_with_matches = {}
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            if start == end:
+                continue
+            line = bisect_right(offsets, start) - 1
+            if text.find('\n', start, end) >= 0:
+                # Scanned across line breaks; those lines are rescanned one by one below
+                for spanned in range(line, bisect_right(offsets, end)):
+                    lines_with_matches[spanned] = None
+                continue
+            spans = lines_with_matches.setdefault(line, [])
+            if spans is not None:
+                spans.append((start - offsets[line], end - offsets[line]))
+
+        self.line_matches = [()] * len(offsets)
+        for line, spans in lines_with_matches.items():
+            if spans is None:
+                end = offsets[line + 1] - 1 if line + 1 < len(offsets) else len(text)
+                self.line_matches[line] = self._scan_line(text[offsets[line]:end])
+            else:
+                self.line_matches[line] = tuple(spans)
+        self.count = sum(len(spans) for spans in self.line_matches)
+
+    def update(self, first, old_end, new_lines):
+        """Old lines [first, old_end) were replaced by new_lines; rescan only those"""
+        scanned = [self._scan_line(line) for line in new_lines]
+        self.count += sum(len(spans) for spans in scanned)
+        self.count -= sum(len(spans) for spans in self.line_matches[first:old_end])
+        self.line_matches[first:old_end] = scanned
+
+    def ordinal(self, line, column):
+        """1-based position of the match starting at (line, column) among all matches"""
+        before = sum(len(spans) for spans in self.line_matches[:line])
+        for i, (start, _) in enumerate(self.line_matches[line]):
+            if start == column:
+                return before + i + 1
+        return None
+
+    def next_match(self, line, column, backwards=False):
+        """First match after (or last before) a position, wrapping around; (line, start, end) or None"""
+        if not self.count:
+            return None
+        total = len(self.line_matches)
+        if not backwards:
+            for start, end in self.line_matches[line]:
+                if start > column:
+                    return line, start, end
+            for offset in range(1, total + 1):
+                current = (line + offset) % total
+                if self.line_matches[current]:
+                    start, end = self.line_matches[current][0]
+                    return current, start, end
+        else:
+            for start, end in reversed(self.line_matches[line]):
+                if start < column:
+                    return line, start, end
+            for offset in range(1, total + 1):
+                current = (line - offset) % total
+                if self.line_matches[current]:
+                    start, end = self.line_matches[current][-1]
+                    return current, start, end
+        return None
@@ -0,0 +1,57 @@
+import tkinter as tk
+
+
+class LineNumberCanvas(tk.Canvas):
+    """Line-number gutter that only draws the lines visible in a text widget"""
+
+    def __init__(self, master, text_widget, font, fg='#858585', bg='#2d2d2d', **kwargs):
+        super().__init__(master, bg=bg, highlightthickness=0, borderwidth=0, **kwargs)
+        self.text_widget = text_widget
+        self.font = font
+        self.fg = fg
+        # Canvas text items reused from one redraw to the next
+        self._items = []
+        self._digits = 0
+        # Added to every number, for widgets showing a window onto a longer
+        # document; line_total overrides the widget's line count for sizing
+        self.line_offset = 0
+        self.line_total = None
+
+        self.bind('<Configure>', lambda event: self.redraw())
+
+    def redraw(self):
+        """Draw a number for every line currently displayed by the text widget"""
+        text = self.text_widget
+        line_count = self.line_total or int(text.index('end-1c').split('.')[0]) + self.line_offset
+
+        # Widen the gutter when the line count gains a digit
+        digits = max(3, len(str(line_count)))
+        if digits != self._digits:
+            self._digits = digits
+            self.configure(width=self.font.measure('0' * (digits + 1)) + 6)
+        x = int(self.cget('width')) // 2
+
+        used = 0
+        index = text.index('@0,0')
+        while True:
+            info = text.dlineinfo(index)
+            if info is None:
+                break
+            line = str(int(index.split('.')[0]) + self.line_offset)
+            if used < len(self._items):
+                item = self._items[used]
+                self.coords(item, x, info[1])
+                self.itemconfigure(item, text=line, state='normal')
+            else:
+                item = self.create_text(x, info[1], anchor='n', text=line, font=self.font, fill=self.fg)
+                self._items.append(item)
+            used += 1
+
+            next_index = text.index(f"{index}+1line")
+            if next_index == index:
+                break
+            index = next_index
+
+        # Hide items left over from a taller viewport
+        for item in self._items[used:]:
+            self.itemconfigure(item, state='hidden')
@@ -0,0 +1,133 @@
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+
+from encoding_detection import detect_encoding
+
+
+_NEWLINE = re.compile(rb'\n')
+
+
+class MappedDocument:
+    """Read-only view of a file through mmap, with an index of line start offsets.
+
+    Nothing but the index is kept in memory; lines are decoded from the
+    mapping when asked for. build_index() is meant to run on a worker thread
+    while the mainloop already reads the lines indexed so far. Without an
+    explicit encoding it detects one first, so encoding stays None until
+    the first lines are indexed.
+    """
+
+    def __init__(self, path, encoding=None):
+        self.path = path
+        if encoding is not None:
+            self._check_encoding(encoding)
+        self.encoding = encoding
+
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # Mapping an empty file fails, so empty bytes stand in for it
+        self._view = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        # Byte offset at which every line starts; line 0 starts at 0
+        self.line_starts = array('Q', [0])
+        self.indexed = False
+
+    def close(self):
+        """Release the mapping and the file"""
+        if isinstance(self._view, mmap.mmap):
+            self._view.close()
+        self._file.close()
+
+    @staticmethod
+    def _check_encoding(encoding):
+        if encoding.startswith('utf-16'):
+            raise ValueError("The viewer needs an ASCII-compatible encoding, not UTF-16")
+
+    def detect_encoding(self):
+        """Detect the encoding from a bounded sample unless it is known; raises ValueError for UTF-16"""
+        if self.encoding is None:
+            encoding, _ = detect_encoding(self.path)
+            self._check_encoding(encoding)
+            self.encoding = encoding
+        return self.encoding
+
+    def build_index(self, chunk_size=4 * 1024 * 1024, on_progress=None, cancelled=lambda: False):
+        """Index line starts chunk by chunk; on_progress(fraction) after each chunk.
+
+        Detects the encoding first if it is not known yet.
+        """
+        self.detect_encoding()
+        position = 0
+        while position < self.size and not cancelled():
+            end = min(position + chunk_size, self.size)
+            starts = array('Q', (match.end() for match in _NEWLINE.finditer(self._view, position, end)))
+            # Extending from another array is a single step the mainloop never sees half-done
+            self.line_starts.extend(starts)
+            position = end
+            if on_progress:
+                on_progress(position / self.size)
+        self.indexed = not cancelled()
+
+    @property
+    def line_count(self):
+        """Number of lines available so far"""
+        if self.indexed:
+            return len(self.line_starts)
+        # The last indexed line may continue past the indexed part
+        return max(0, len(self.line_starts) - 1)
+
+    def _line_end(self, line):
+        """Byte offset just past line's text, excluding its line break"""
+        if line + 1 < len(self.line_starts):
+            return self.line_starts[line + 1] - 1
+        return self.size
+
+    def get_lines(self, first, count):
+        """Decode lines [first, first + count) without their line breaks"""
+        last = min(first + count, self.line_count)
+        if first >= last:
+            return []
+        start = self.line_starts[first]
+        end = self._line_end(last - 1)
+        text = self._view[start:end].decode(self.encoding, errors='replace')
+        lines = text.split('\n')
+        return [line[:-1] if line.endswith('\r') else line for line in lines]
+
+    def line_of_offset(self, offset):
+        """0-based line containing a byte offset"""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def column_of_offset(self, line, offset):
+        """Character column of a byte offset within a line"""
+        return len(self._view[self.line_starts[line]:offset].decode(self.encoding, errors='replace'))
+
+    def compile_pattern(self, text, regex=False, ignore_case=False):
+        """Compile a search for text as a bytes regex in the file's encoding"""
+        pattern = text if regex else re.escape(text)
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        return re.compile(pattern.encode(self.encoding), flags)
+
+    def search(self, pattern, offset, backwards=False, block_size=1024 * 1024):
+        """Find the next (or previous) match of a compiled bytes pattern from a byte offset.
+
+        Returns (start, end) byte offsets or None. Matches spanning more than a
+        block are only found searching forwards.
+        """
+        if not backwards:
+            match = pattern.search(self._view, offset)
+            return match.span() if match else None
+
+        # Scan blocks backwards from the offset and keep the last match in each
+        end = offset
+        while end > 0:
+            start = max(0, end - block_size)
+            last = None
+            for match in pattern.finditer(self._view, start, end):
+                if match.end() > match.start():
+                    last = match
+            if last is not None:
+                return last.span()
+            end = start
+        return None
@@ -0,0 +1,355 @@
+import os
+import re
+import threading
+
+import customtkinter as ctk
+import tkinter as tk
+
+from line_number_canvas import LineNumberCanvas
+from mapped_document import MappedDocument
+from pawn_lexer import NORMAL
+from syntax_highlighter import SyntaxHighlighter
+
+
+class MappedViewer(ctk.CTkToplevel):
+    """Read-only window onto a memory-mapped file.
+
+    The text widget only ever holds the lines on screen; scrolling pages a new
+    window of lines in from the mapping, so a file of any size costs little
+    more than its line index.
+    """
+
+    def __init__(self, master, path, font, line_font):
+        self.document = MappedDocument(path)
+        super().__init__(master)
+        self.title(f"CSER Viewer - {os.path.basename(path)} (read-only)")
+        self.geometry("1000x700")
+        self.font = font
+
+        # First document line (0-based) shown at the top of the widget
+        self.first_line = 0
+        # Lines lexed above the window to find the state it starts in
+        self.context_lines = 500
+        self.poll_ms = 100
+
+        self._closed = False
+        self._threads = 0
+        self._lock = threading.Lock()
+        self._poll_id = None
+        self._index_progress = 0.0
+        # Set on the worker when the file cannot be viewed, e.g. UTF-16
+        self._index_error = None
+        self._shown_line_count = -1
+        # Byte span of the current search match, and a finished search waiting
+        # for the mainloop
+        self._match = None
+        self._match_position = None
+        self._search_result = None
+        self._searching = False
+
+        self._create_widgets(font, line_font)
+        self.highlighter = SyntaxHighlighter(self.text)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self._run_thread(self._build_index)
+        self._poll_id = self.after(1, self._poll)
+
+    def _create_widgets(self, font, line_font):
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # Search bar
+        search_frame = ctk.CTkFrame(self, corner_radius=8)
+        search_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
+        search_frame.grid_columnconfigure(0, weight=1)
+
+        self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="Search...", height=30)
+        self.search_entry.grid(row=0, column=0, sticky="ew", padx=(8, 4), pady=6)
+        self.search_entry.bind('<Return>', lambda event: self.find_next())
+        self.search_entry.bind('<Shift-Return>', lambda event: self.find_previous())
+
+        self.regex_var = tk.BooleanVar(value=False)
+        self.case_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(search_frame, text="Regex", variable=self.regex_var, width=70).grid(row=0, column=1, padx=4)
+        ctk.CTkCheckBox(search_frame, text="Match case", variable=self.case_var, width=100).grid(row=0, column=2, padx=4)
+        ctk.CTkButton(search_frame, text="◀ Prev", width=70, height=28, command=self.find_previous).grid(row=0, column=3, padx=4)
+        ctk.CTkButton(search_frame, text="Next ▶", width=70, height=28, command=self.find_next).grid(row=0, column=4, padx=4)
+
+        self.status_label = ctk.CTkLabel(search_frame, text="", font=ctk.CTkFont(size=12),
+                                         text_color=("#7C7C7C", "#A0A0A0"))
+        self.status_label.grid(row=0, column=5, padx=(8, 10))
+
+        # Text area with gutter and scrollbars
+        container = ctk.CTkFrame(self, corner_radius=8)
+        container.grid(row=1, column=0, sticky="nsew", padx=10, pady=(5, 10))
+        container.grid_rowconfigure(0, weight=1)
+        container.grid_columnconfigure(1, weight=1)
+
+        self.text = tk.Text(
+            container,
+            wrap=tk.NONE,
+            font=font,
+            bg='#1e1e1e',
+            fg='#d4d4d4',
+            selectbackground='#264f78',
+            selectforeground='#ffffff',
+            relief='flat',
+            borderwidth=0,
+            padx=8,
+            pady=0,
+            state='disabled',
+            cursor='arrow'
+        )
+        self.text.tag_configure('search_match', background='#515c6a')
+
+        self.gutter = LineNumberCanvas(container, self.text, font=line_font, takefocus=0)
+        self.v_scrollbar = ctk.CTkScrollbar(container, command=self.on_scrollbar)
+        self.h_scrollbar = ctk.CTkScrollbar(container, orientation="horizontal", command=self.text.xview)
+        self.text.configure(xscrollcommand=self.h_scrollbar.set)
+
+        self.gutter.grid(row=0, column=0, sticky="ns", padx=(10, 0), pady=10)
+        self.text.grid(row=0, column=1, sticky="nsew", padx=(2, 0), pady=10)
+        self.v_scrollbar.grid(row=0, column=2, sticky="ns", padx=(5, 10), pady=10)
+        self.h_scrollbar.grid(row=1, column=1, sticky="ew", padx=5, pady=(0, 10))
+
+        # Scrolling moves the window over the document instead of the widget
+        for widget in (self.text, self.gutter):
+            widget.bind('<MouseWheel>', self.on_mouse_wheel)
+            widget.bind('<Button-4>', lambda event: self.scroll_lines(-3) or 'break')
+            widget.bind('<Button-5>', lambda event: self.scroll_lines(3) or 'break')
+        self.text.bind('<Up>', lambda event: self.scroll_lines(-1) or 'break')
+        self.text.bind('<Down>', lambda event: self.scroll_lines(1) or 'break')
+        self.text.bind('<Prior>', lambda event: self.scroll_lines(-self.visible_rows()) or 'break')
+        self.text.bind('<Next>', lambda event: self.scroll_lines(self.visible_rows()) or 'break')
+        self.text.bind('<Control-Home>', lambda event: self.scroll_to(0) or 'break')
+        self.text.bind('<Control-End>', lambda event: self.scroll_to(self.document.line_count) or 'break')
+        self.text.bind('<Configure>', lambda event: self.render())
+        self.bind('<Control-f>', lambda event: self.search_entry.focus_set())
+
+    def close(self):
+        """Close the window; the mapping is released once worker threads stop"""
+        self._closed = True
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.highlighter.shutdown()
+        self._release()
+        self.destroy()
+
+    def _run_thread(self, target):
+        """Run target on a worker thread that keeps the mapping open while it works"""
+        with self._lock:
+            self._threads += 1
+
+        def run():
+            try:
+                target()
+            finally:
+                with self._lock:
+                    self._threads -= 1
+                self._release()
+
+        threading.Thread(target=run, name="mapped-viewer", daemon=True).start()
+
+    def _release(self):
+        """Close the document once the window is closed and no thread uses it"""
+        with self._lock:
+            if self._closed and self._threads == 0 and self.document is not None:
+                self.document.close()
+                self.document = None
+
+    def _build_index(self):
+        """Worker thread: detect the encoding and index the lines"""
+        try:
+            self.document.build_index(
+                on_progress=self._on_index_progress,
+                cancelled=lambda: self._closed
+            )
+        except (OSError, ValueError) as e:
+            self._index_error = e
+
+    def _on_index_progress(self, fraction):
+        """Worker thread: remember indexing progress for the next poll"""
+        self._index_progress = fraction
+
+    def _poll(self):
+        """Mainloop: follow indexing progress and collect finished searches"""
+        self._poll_id = None
+        document = self.document
+        # Read first: a search clears the flag only after posting its result
+        searching = self._searching
+
+        if document.line_count != self._shown_line_count:
+            self._shown_line_count = document.line_count
+            # Render while the window is not full yet, otherwise only the
+            # scrollbar and the gutter width change
+            if self.first_line + self.visible_rows() >= self._shown_line_count:
+                self.render()
+            else:
+                self._update_scrollbar()
+        if self._index_error is not None:
+            self.status_label.configure(text=f"Could not open file: {self._index_error}")
+            return
+        if not document.indexed:
+            self.status_label.configure(text=f"Indexing... {int(self._index_progress * 100)}%")
+        elif not searching and self._search_result is None and self._match is None:
+            self.status_label.configure(text=f"{document.line_count:,} lines, {document.encoding}")
+
+        if self._search_result is not None:
+            result, self._search_result = self._search_result, None
+            self._show_search_result(*result)
+
+        if not document.indexed or searching:
+            self._poll_id = self.after(self.poll_ms, self._poll)
+
+    def visible_rows(self):
+        """Number of lines the text widget can show"""
+        linespace = self.font.metrics('linespace') or 1
+        return max(1, self.text.winfo_height() // linespace + 1)
+
+    def scroll_lines(self, count):
+        """Move the window by count lines"""
+        self.scroll_to(self.first_line + count)
+
+    def scroll_to(self, line):
+        """Show the window starting at a 0-based document line"""
+        last_first = max(0, self.document.line_count - self.visible_rows() + 1)
+        line = max(0, min(line, last_first))
+        if line != self.first_line:
+            self.first_line = line
+            self.render()
+
+    def on_mouse_wheel(self, event):
+        self.scroll_lines(-int(event.delta / 120) * 3)
+        return 'break'
+
+    def on_scrollbar(self, *args):
+        """Translate scrollbar commands into document lines"""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.document.line_count))
+        elif args[0] == 'scroll':
+            step = self.visible_rows() if args[2] == 'pages' else 1
+            self.scroll_lines(int(args[1]) * step)
+
+    def _update_scrollbar(self):
+        total = max(1, self.document.line_count)
+        self.v_scrollbar.set(self.first_line / total, min(1.0, (self.first_line + self.visible_rows()) / total))
+
+    def _start_state(self):
+        """Lexer state at first_line, from lexing a bounded run of lines above it"""
+        first = max(0, self.first_line - self.context_lines)
+        state = NORMAL
+        lex_line = self.highlighter.lexer.lex_line
+        for line in self.document.get_lines(first, self.first_line - first):
+            _, state = lex_line(line, state)
+        return state
+
+    def render(self):
+        """Page the lines of the current window into the text widget"""
+        if self.document is None:
+            return
+        rows = self.visible_rows()
+        lines = self.document.get_lines(self.first_line, rows)
+
+        self.text.configure(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', '\n'.join(lines))
+        self.text.configure(state='disabled')
+
+        self.gutter.line_offset = self.first_line
+        self.gutter.line_total = self.document.line_count
+        self.gutter.redraw()
+        self._update_scrollbar()
+
+        # Every page is highlighted from scratch, starting in the right state
+        self.highlighter.reset()
+        self.highlighter.initial_state = self._start_state()
+        self.highlighter.highlight_syntax()
+
+        self._tag_match()
+
+    def _tag_match(self):
+        """Mark the current search match if it lies in the window"""
+        self.text.tag_remove('search_match', '1.0', 'end')
+        if self._match is None:
+            return
+        (start_line, start_column), (end_line, end_column) = self._match_position
+        if end_line < self.first_line or start_line >= self.first_line + self.visible_rows():
+            return
+        start = f"{start_line - self.first_line + 1}.{start_column}"
+        end = f"{end_line - self.first_line + 1}.{end_column}"
+        self.text.tag_add('search_match', start, end)
+        self.text.see(start)
+
+    def find_next(self):
+        self._find(backwards=False)
+
+    def find_previous(self):
+        self._find(backwards=True)
+
+    def _find(self, backwards):
+        """Search the mapped file on a worker thread from the current match or window"""
+        text = self.search_entry.get()
+        if not text or self._searching or self.document is None:
+            return
+        if self.document.encoding is None:
+            self.status_label.configure(text="Detecting the encoding...")
+            return
+        try:
+            pattern = self.document.compile_pattern(text, regex=self.regex_var.get(),
+                                                    ignore_case=not self.case_var.get())
+        except (re.error, UnicodeEncodeError) as e:
+            self.status_label.configure(text=f"Invalid search: {e}")
+            return
+
+        if self._match is not None:
+            start, end = self._match
+            offset = start if backwards else max(end, start + 1)
+        else:
+            offset = self.document.line_starts[min(self.first_line, len(self.document.line_starts) - 1)]
+
+        document = self.document
+        self._searching = True
+        self.status_label.configure(text="Searching...")
+
+        def search():
+            try:
+                self._search_result = (document.search(pattern, offset, backwards), None)
+            except Exception as e:
+                self._search_result = (None, e)
+            finally:
+                self._searching = False
+
+        self._run_thread(search)
+        if self._poll_id is None:
+            self._poll_id = self.after(self.poll_ms, self._poll)
+
+    def _show_search_result(self, span, error):
+        """Scroll to a match found by the worker thread"""
+        if error is not None:
+            self.status_label.configure(text=f"Search failed: {error}")
+            return
+        if span is None:
+            self.status_label.configure(text="No more matches")
+            return
+
+        document = self.document
+        start_line = document.line_of_offset(span[0])
+        end_line = document.line_of_offset(span[1])
+        if end_line >= document.line_count:
+            self.status_label.configure(text="Match lies past the indexed part; try again when indexing finishes")
+            return
+
+        self._match = span
+        self._match_position = (
+            (start_line, document.column_of_offset(start_line, span[0])),
+            (end_line, document.column_of_offset(end_line, span[1])),
+        )
+        self.status_label.configure(text=f"Line {start_line + 1:,}")
+
+        rows = self.visible_rows()
+        if not self.first_line <= start_line < self.first_line + rows - 1:
+            self.first_line = max(0, start_line - rows // 3)
+            self.render()
+        else:
+            self._tag_match()
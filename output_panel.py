@@ -0,0 +1,115 @@
+import customtkinter as ctk
+import tkinter as tk
+
+from compiler_output import parse_diagnostic
+
+
+class OutputPanel(ctk.CTkFrame):
+    """Compiler output below the editor; diagnostics are underlined and open their line when clicked"""
+
+    def __init__(self, master, font, on_open=None, **kwargs):
+        super().__init__(master, corner_radius=8, **kwargs)
+        # on_open(diagnostic) with a parse_diagnostic() tuple
+        self.on_open = on_open
+        self.visible = False
+        # (path, line, kind, code, message) in output order
+        self.diagnostics = []
+        # Text widget line -> diagnostic
+        self._locations = {}
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        self.title_label = ctk.CTkLabel(self, text="Output", font=ctk.CTkFont(size=13, weight="bold"))
+        self.title_label.grid(row=0, column=0, sticky="w", padx=10, pady=(4, 0))
+        self.summary_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=12),
+                                          text_color=("#7C7C7C", "#A0A0A0"))
+        self.summary_label.grid(row=0, column=1, sticky="e", padx=4, pady=(4, 0))
+        ctk.CTkButton(self, text="✕", width=28, height=24, fg_color="transparent",
+                      hover_color="#404040", command=self.hide).grid(row=0, column=2, padx=(2, 8), pady=(4, 0))
+
+        self.text = tk.Text(
+            self,
+            height=8,
+            wrap=tk.NONE,
+            font=font,
+            bg='#1e1e1e',
+            fg='#d4d4d4',
+            selectbackground='#264f78',
+            relief='flat',
+            borderwidth=0,
+            padx=8,
+            pady=4,
+            state='disabled',
+            cursor='arrow'
+        )
+        self.text.tag_configure('command', foreground='#858585')
+        self.text.tag_configure('error', foreground='#f48771')
+        self.text.tag_configure('warning', foreground='#cca700')
+        self.text.tag_configure('diagnostic', underline=True)
+        self.text.tag_bind('diagnostic', '<Enter>', lambda event: self.text.configure(cursor='hand2'))
+        self.text.tag_bind('diagnostic', '<Leave>', lambda event: self.text.configure(cursor='arrow'))
+        self.text.tag_bind('diagnostic', '<Button-1>', self.on_click)
+        v_scrollbar = ctk.CTkScrollbar(self, command=self.text.yview)
+        self.text.configure(yscrollcommand=v_scrollbar.set)
+        self.text.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=(5, 0), pady=(0, 5))
+        v_scrollbar.grid(row=1, column=2, sticky="ns", padx=5, pady=(0, 5))
+
+    def show(self, row=4):
+        """Show the panel below the editor"""
+        if not self.visible:
+            self.grid(row=row, column=0, sticky="ew", padx=15, pady=(0, 10))
+            self.visible = True
+
+    def hide(self):
+        if self.visible:
+            self.grid_remove()
+            self.visible = False
+
+    def clear(self, command=None):
+        """Start a new run, echoing the command line that produced it"""
+        self.diagnostics = []
+        self._locations = {}
+        self.summary_label.configure(text="")
+        self.text.configure(state='normal')
+        self.text.delete('1.0', 'end')
+        if command:
+            self.text.insert('end', f"> {command}\n", 'command')
+        self.text.configure(state='disabled')
+
+    def append(self, line, directory=None):
+        """Add an output line; diagnostics are parsed against directory"""
+        diagnostic = parse_diagnostic(line, directory)
+        self.text.configure(state='normal')
+        if diagnostic is None:
+            self.text.insert('end', line + '\n')
+        else:
+            row = int(self.text.index('end-1c').split('.')[0])
+            kind = 'warning' if diagnostic[2] == 'warning' else 'error'
+            self.text.insert('end', line, (kind, 'diagnostic'), '\n')
+            self.diagnostics.append(diagnostic)
+            self._locations[row] = diagnostic
+        self.text.configure(state='disabled')
+        self.text.see('end')
+
+    def note(self, text):
+        """Add a line of the editor's own, e.g. a build stage result"""
+        self.text.configure(state='normal')
+        self.text.insert('end', text + '\n', 'command')
+        self.text.configure(state='disabled')
+        self.text.see('end')
+
+    def set_summary(self, text):
+        self.summary_label.configure(text=text)
+
+    def counts(self):
+        """(errors, warnings) among the diagnostics so far"""
+        warnings = sum(1 for diagnostic in self.diagnostics if diagnostic[2] == 'warning')
+        return len(self.diagnostics) - warnings, warnings
+
+    def on_click(self, event):
+        row = int(self.text.index(f"@{event.x},{event.y}").split('.')[0])
+        diagnostic = self._locations.get(row)
+        if diagnostic and self.on_open:
+            self.on_open(diagnostic)
+        return 'break'
@@ -0,0 +1,167 @@
+import re
+from array import array
+from bisect import bisect_right
+
+
+# Lexer states carried from the end of one line into the next
+NORMAL = 0
+IN_COMMENT = 1  # Inside an unterminated /* ... */ block
+IN_STRING = 2   # Inside a string continued with a trailing backslash
+
+# Token kinds - the numeric codes stored in TokenStream.kinds index this tuple
+TOKEN_KINDS = ('keyword', 'string', 'comment', 'number', 'preprocessor', 'function')
+KEYWORD, STRING, COMMENT, NUMBER, PREPROCESSOR, FUNCTION = range(len(TOKEN_KINDS))
+
+# C/SourceMod keywords
+KEYWORDS = (
+    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do',
+    'double', 'else', 'enum', 'extern', 'float', 'for', 'goto', 'if',
+    'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
+    'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while',
+    'public', 'stock', 'native', 'forward', 'new', 'decl', 'funcenum', 'functag',
+    'Action', 'Plugin', 'Handle', 'bool', 'true', 'false', 'null', 'INVALID_HANDLE'
+)
+
+# Single master pattern applied to one line at a time - alternatives are
+# tried left to right at each position, so comments and strings swallow
+# anything that looks like a keyword, number or call inside them
+TOKEN_PATTERN = re.compile(
+    r'(?P<comment>//.*)'
+    r'|(?P<block>/\*)'
+    r'|(?P<string>"(?:[^"\\^]|[\\^].)*(?P<close>"|\\$)?)'
+    r"|(?P<char>'(?:[^'\\^]|[\\^].)*'?)"
+    r'|(?P<preprocessor>#\w+)'
+    r'|(?P<number>\b(?:0[xX][0-9a-fA-F]+|\d+\.?\d*)\b)'
+    r'|(?P<function>[A-Za-z_]\w*(?=\s*\())'
+    r'|(?P<word>[A-Za-z_]\w*)'
+)
+# Remainder of a string continued from the previous line
+STRING_TAIL_PATTERN = re.compile(r'(?:[^"\\^]|[\\^].)*(?P<close>"|\\$)?')
+
+
+class TokenStream:
+    """Tokens as parallel arrays of kind codes and [start, end) character offsets"""
+
+    def __init__(self):
+        self.kinds = array('I')
+        self.starts = array('I')
+        self.ends = array('I')
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return zip(self.kinds, self.starts, self.ends)
+
+
+class PawnLexer:
+    """Line-oriented Pawn/SourcePawn lexer with no GUI dependency"""
+
+    def __init__(self, keywords=KEYWORDS):
+        self.keyword_set = frozenset(keywords)
+
+    def lex_line(self, line, state=NORMAL):
+        """Tokenize one line starting in the given state.
+
+        Returns a tuple of (kind, start_column, end_column) and the state at
+        the end of the line.
+        """
+        tokens = []
+        length = len(line)
+        pos = 0
+
+        if state == IN_COMMENT:
+            end = line.find('*/')
+            if end < 0:
+                return (((COMMENT, 0, length),) if length else ()), IN_COMMENT
+            pos = end + 2
+            tokens.append((COMMENT, 0, pos))
+        elif state == IN_STRING:
+            match = STRING_TAIL_PATTERN.match(line)
+            pos = match.end()
+            if pos:
+                tokens.append((STRING, 0, pos))
+            if match.group('close') == '\\':
+                return tuple(tokens), IN_STRING
+
+        search = TOKEN_PATTERN.search
+        keyword_set = self.keyword_set
+        while True:
+            match = search(line, pos)
+            if match is None:
+                break
+            group = match.lastgroup
+            start, pos = match.span()
+            if group == 'word':
+                if match.group() not in keyword_set:
+                    continue
+                kind = KEYWORD
+            elif group == 'function':
+                kind = KEYWORD if match.group() in keyword_set else FUNCTION
+            elif group == 'comment':
+                kind = COMMENT
+            elif group == 'block':
+                end = line.find('*/', pos)
+                if end < 0:
+                    tokens.append((COMMENT, start, length))
+                    return tuple(tokens), IN_COMMENT
+                pos = end + 2
+                kind = COMMENT
+            elif group == 'string':
+                if match.group('close') == '\\':
+                    tokens.append((STRING, start, pos))
+                    return tuple(tokens), IN_STRING
+                kind = STRING
+            elif group == 'char':
+                kind = STRING
+            elif group == 'number':
+                kind = NUMBER
+            else:
+                kind = PREPROCESSOR
+            tokens.append((kind, start, pos))
+
+        return tuple(tokens), NORMAL
+
+    def tokenize(self, text):
+        """Tokenize a whole buffer into a TokenStream.
+
+        Tokens never span lines - a block comment or continued string is
+        reported as one token per line it covers.
+        """
+        stream = TokenStream()
+        kinds = stream.kinds
+        starts = stream.starts
+        ends = stream.ends
+        lex_line = self.lex_line
+        state = NORMAL
+        offset = 0
+        for line in text.split('\n'):
+            tokens, state = lex_line(line, state)
+            for kind, start, end in tokens:
+                kinds.append(kind)
+                starts.append(offset + start)
+                ends.append(offset + end)
+            offset += len(line) + 1
+        return stream
+
+
+def tokenize(text, keywords=KEYWORDS):
+    """Tokenize text with a default lexer"""
+    return PawnLexer(keywords).tokenize(text)
+
+
+def line_offsets(text):
+    """Return the character offset at which each line of text starts"""
+    offsets = array('I', [0])
+    find = text.find
+    pos = find('\n')
+    while pos >= 0:
+        offsets.append(pos + 1)
+        pos = find('\n', pos + 1)
+    return offsets
+
+
+def offset_to_index(offsets, offset):
+    """Convert a character offset into a Tk "line.column" index"""
+    line = bisect_right(offsets, offset) - 1
+    return f"{line + 1}.{offset - offsets[line]}"
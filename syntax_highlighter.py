@@ -1,9 +1,42 @@
-import re
+import queue
+import threading
+import time
+
+from pawn_lexer import KEYWORDS, NORMAL, TOKEN_KINDS, PawnLexer
 
 
 class SyntaxHighlighter:
     def __init__(self, text_widget):
         self.text_widget = text_widget
+        self._after_id = None
+        self._poll_id = None
+        
+        # Lines above and below the viewport highlighted eagerly
+        self.viewport_margin = 50
+        # Time slice for each background highlighting step
+        self.chunk_time_ms = 8
+        self.chunk_lines = 200
+        # Lines the lexer thread hands back at a time, and how often the
+        # mainloop collects them
+        self.worker_chunk_lines = 1000
+        self.poll_ms = 5
+        
+        # Lexing runs on a worker thread; only the newest request is kept and
+        # results from older generations are dropped
+        self._generation = 0
+        self._request = None
+        self._condition = threading.Condition()
+        self._results = queue.Queue()
+        self._worker = None
+        # Set by shutdown(); the worker thread exits once it sees it
+        self._closed = False
+        
+        # Set when exact edit ranges are reported through note_edit, so the
+        # buffer no longer has to be diffed against the cache on every pass
+        self.tracking_edits = False
+        # Lexer state at the top of the widget; a window onto a larger
+        # document may start inside a comment or string
+        self.initial_state = NORMAL
         self.setup_syntax_highlighting()
     
     def setup_syntax_highlighting(self):
@@ -20,73 +53,355 @@ class SyntaxHighlighter:
         }
         
         # C/SourceMod keywords
-        self.keywords = [
-            'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do',
-            'double', 'else', 'enum', 'extern', 'float', 'for', 'goto', 'if',
-            'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
-            'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while',
-            'public', 'stock', 'native', 'forward', 'new', 'decl', 'funcenum', 'functag',
-            'Action', 'Plugin', 'Handle', 'bool', 'true', 'false', 'null', 'INVALID_HANDLE'
-        ]
+        self.keywords = list(KEYWORDS)
+        self.lexer = PawnLexer(self.keywords)
+        
+        # Per-line caches describing the text as it was last highlighted
+        self.reset()
         
         # Configure tags
         for tag, color in self.syntax_colors.items():
             self.text_widget.tag_configure(tag, foreground=color)
     
+    def reset(self):
+        """Forget cached lexer state, e.g. after the whole buffer was replaced"""
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+        if self._poll_id is not None:
+            self.text_widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        # Anything still in flight on the worker now belongs to an old generation
+        self._generation += 1
+        self.lines = []
+        self.line_states = []
+        self.line_tokens = []
+        # Tokens currently tagged in the widget per line, None when unknown
+        self.applied_tokens = []
+        # Lines whose tokens are computed but not yet applied to the widget
+        self.pending = set()
+        # Next line of the re-lex job (None when idle) and the first line it
+        # may stop at once the end state matches the cache again
+        self._relex_line = None
+        self._relex_until = 0
+        # The next pass has to diff the whole buffer to rebuild the caches
+        self._needs_full_sync = True
+        # Edits have been noted since the last job was handed to the worker
+        self._edited = False
+    
+    def shutdown(self):
+        """Stop highlighting for good and let the lexer thread exit"""
+        self.reset()
+        with self._condition:
+            self._closed = True
+            self._request = None
+            self._condition.notify()
+    
+    def snapshot(self):
+        """Return the lexer caches for the text in the widget, or None while they are incomplete"""
+        if self._needs_full_sync or self._edited or self._relex_line is not None:
+            return None
+        return self.lines, self.line_states, self.line_tokens
+    
+    @staticmethod
+    def snapshot_size(snapshot):
+        """Rough number of bytes a snapshot keeps alive"""
+        lines, _, line_tokens = snapshot
+        # List slots and small tuples dominate; token tuples are three small ints
+        return (sum(len(line) for line in lines) + 120 * len(lines)
+                + 100 * sum(len(tokens) for tokens in line_tokens))
+    
+    def restore(self, snapshot):
+        """Adopt caches from snapshot() once the same text is back in the widget untagged.
+        
+        Nothing is lexed; the cached tokens are only tagged again, viewport first.
+        """
+        self.reset()
+        lines, line_states, line_tokens = snapshot
+        self.lines = lines
+        self.line_states = list(line_states)
+        self.line_tokens = list(line_tokens)
+        self.applied_tokens = [()] * len(lines)
+        self.pending = {i for i, tokens in enumerate(line_tokens) if tokens}
+        self._needs_full_sync = False
+        self.highlight_visible()
+    
+    def _changed_lines(self, lines):
+        """Compare against the cached lines, returning (first, old_end, new_end) or None"""
+        old_lines = self.lines
+        old_end = len(old_lines)
+        new_end = len(lines)
+        limit = min(old_end, new_end)
+        
+        first = 0
+        while first < limit and old_lines[first] == lines[first]:
+            first += 1
+        if first == old_end == new_end:
+            return None
+        
+        while old_end > first and new_end > first and old_lines[old_end - 1] == lines[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+        return first, old_end, new_end
+    
+    def _splice(self, first, old_end, new_end):
+        """Resize the per-line caches for an edit replacing old lines [first, old_end)"""
+        count = new_end - first
+        delta = new_end - old_end
+        # Results still in flight use the old line numbers; the job is resumed
+        # from _relex_line below instead
+        self._generation += 1
+        self.line_states[first:old_end] = [None] * count
+        self.line_tokens[first:old_end] = [()] * count
+        # Edited lines may carry tags inherited from their neighbours
+        self.applied_tokens[first:old_end] = [None] * count
+        
+        if self.pending:
+            self.pending = {
+                i if i < first else i + delta
+                for i in self.pending
+                if i < first or i >= old_end
+            }
+        
+        def shift(i):
+            if i < first:
+                return i
+            return i + delta if i >= old_end else new_end
+        
+        # Fold the edit into any job still in progress - the job may not stop
+        # before the line it had reached, since the cached states past that
+        # point belong to the text as it was before the earlier edit
+        if self._relex_line is None:
+            self._relex_line = first
+            self._relex_until = new_end
+        else:
+            self._relex_until = max(new_end, shift(self._relex_line), shift(self._relex_until))
+            self._relex_line = min(first, self._relex_line)
+    
+    def _submit(self):
+        """Hand the re-lex job and a snapshot of the text to the worker thread"""
+        if self._relex_line is None or self._closed:
+            return
+        
+        request = (
+            self._generation,
+            self.lines,
+            self._relex_line,
+            self._relex_until,
+            list(self.line_states),
+            self.initial_state,
+        )
+        with self._condition:
+            self._request = request
+            self._condition.notify()
+        
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._worker_loop, name="highlight-lexer", daemon=True)
+            self._worker.start()
+        if self._poll_id is None:
+            self._poll_id = self.text_widget.after(self.poll_ms, self._poll_results)
+    
+    def _worker_loop(self):
+        """Lex the newest request until shutdown()"""
+        while True:
+            with self._condition:
+                while self._request is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                request = self._request
+                self._request = None
+            self._lex_job(*request)
+    
+    def _lex_job(self, generation, lines, i, until, line_states, initial_state):
+        """Lex from line i until the end state matches the cache, posting results in chunks"""
+        lex_line = self.lexer.lex_line
+        total = len(lines)
+        state = line_states[i - 1] if i else initial_state
+        chunk_start = i
+        tokens_out = []
+        states_out = []
+        
+        while i < total:
+            # A newer edit has superseded this snapshot
+            if generation != self._generation:
+                return
+            old_state = line_states[i]
+            tokens, state = lex_line(lines[i], state)
+            tokens_out.append(tokens)
+            states_out.append(state)
+            i += 1
+            # An unchanged line ending in its cached state means every line
+            # after it is highlighted correctly already
+            if i > until and state == old_state:
+                break
+            if len(tokens_out) >= self.worker_chunk_lines:
+                self._results.put((generation, chunk_start, tokens_out, states_out, i))
+                chunk_start = i
+                tokens_out = []
+                states_out = []
+        
+        self._results.put((generation, chunk_start, tokens_out, states_out, None))
+    
+    def _poll_results(self):
+        """Merge finished lexer chunks on the mainloop and tag what is visible"""
+        self._poll_id = None
+        merged = False
+        while True:
+            try:
+                generation, start, tokens, states, next_line = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # Stale results describe text that no longer exists
+            if generation != self._generation:
+                continue
+            end = start + len(tokens)
+            self.line_tokens[start:end] = tokens
+            self.line_states[start:end] = states
+            # Only lines whose tokens differ from what is tagged need work
+            applied_tokens = self.applied_tokens
+            pending = self.pending
+            for i in range(start, end):
+                if applied_tokens[i] != tokens[i - start]:
+                    pending.add(i)
+                else:
+                    pending.discard(i)
+            self._relex_line = next_line
+            merged = True
+        
+        if merged:
+            self.highlight_visible()
+        if self._relex_line is not None:
+            self._poll_id = self.text_widget.after(self.poll_ms, self._poll_results)
+    
+    def _apply_lines(self, line_indices):
+        """Bring the widget tags on the given sorted lines in line with their cached tokens"""
+        widget = self.text_widget
+        tags = self.syntax_colors.keys()
+        kind_tags = TOKEN_KINDS
+        line_tokens = self.line_tokens
+        applied_tokens = self.applied_tokens
+        
+        # Lines with unknown tags are cleared outright, one call per tag for
+        # each contiguous run of them
+        runs = []
+        run_start = prev = None
+        for i in line_indices:
+            if applied_tokens[i] is not None:
+                continue
+            if run_start is None:
+                run_start = i
+            elif i != prev + 1:
+                runs.append((run_start, prev))
+                run_start = i
+            prev = i
+        if run_start is not None:
+            runs.append((run_start, prev))
+        for tag in tags:
+            for start, end in runs:
+                widget.tag_remove(tag, f"{start + 1}.0", f"{end + 1}.end")
+        
+        # Everywhere else only ranges that appeared or disappeared are touched
+        additions = {tag: [] for tag in tags}
+        removals = []
+        for i in line_indices:
+            tokens = line_tokens[i]
+            old_tokens = applied_tokens[i]
+            applied_tokens[i] = tokens
+            if old_tokens == tokens:
+                continue
+            prefix = f"{i + 1}."
+            if old_tokens is None:
+                added = tokens
+            else:
+                old_set = set(old_tokens)
+                new_set = set(tokens)
+                added = [token for token in tokens if token not in old_set]
+                for token in old_tokens:
+                    if token not in new_set:
+                        kind, start, end = token
+                        removals.append((kind_tags[kind], prefix + str(start), prefix + str(end)))
+            for kind, start, end in added:
+                additions[kind_tags[kind]].extend((prefix + str(start), prefix + str(end)))
+        
+        # Removals go first so a range re-added under the same tag survives;
+        # additions use line.col indices Tk resolves without counting
+        # characters and are pushed with one tag_add call per tag
+        for tag, start, end in removals:
+            widget.tag_remove(tag, start, end)
+        for tag, indices in additions.items():
+            if indices:
+                widget.tag_add(tag, *indices)
+        self.pending.difference_update(line_indices)
+    
+    def _visible_range(self):
+        """Return the [first, last) line range of the viewport plus margin"""
+        total = len(self.lines)
+        top, bottom = self.text_widget.yview()
+        first = max(0, int(top * total) - self.viewport_margin)
+        last = min(total, int(bottom * total) + 1 + self.viewport_margin)
+        return first, last
+    
+    def highlight_visible(self):
+        """Tag pending lines in the viewport now and leave the rest to the background"""
+        if not self.pending:
+            return
+        
+        first, last = self._visible_range()
+        pending = self.pending
+        visible = [i for i in range(first, last) if i in pending]
+        if visible:
+            self._apply_lines(visible)
+        
+        self._schedule_background()
+    
+    def _schedule_background(self):
+        """Queue a background tagging step if work remains"""
+        if self._after_id is None and self.pending:
+            self._after_id = self.text_widget.after(1, self._background_step)
+    
+    def _background_step(self):
+        """Apply one time-sliced chunk of pending lines"""
+        self._after_id = None
+        deadline = time.perf_counter() + self.chunk_time_ms / 1000
+        
+        while self.pending and time.perf_counter() < deadline:
+            batch = []
+            for i in self.pending:
+                batch.append(i)
+                if len(batch) >= self.chunk_lines:
+                    break
+            batch.sort()
+            self._apply_lines(batch)
+        
+        self._schedule_background()
+    
+    def note_edit(self, first, old_end, new_end):
+        """Record an exact edit: old lines [first, old_end) are now lines [first, new_end)"""
+        if self._needs_full_sync:
+            return
+        
+        # Only the edited lines are read back from the widget
+        new_lines = self.text_widget.get(f"{first + 1}.0", f"{new_end}.end").split('\n')
+        self.lines = self.lines[:first] + new_lines + self.lines[old_end:]
+        self._splice(first, old_end, new_end)
+        self._edited = True
+    
     def highlight_syntax(self):
-        """Apply C/SourceMod syntax highlighting"""
-        # Clear existing tags
-        for tag in self.syntax_colors.keys():
-            self.text_widget.tag_remove(tag, "1.0", "end")
-        
-        content = self.text_widget.get("1.0", "end-1c")
-        
-        # Highlight keywords
-        for keyword in self.keywords:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            for match in re.finditer(pattern, content):
-                start = f"1.0+{match.start()}c"
-                end = f"1.0+{match.end()}c"
-                self.text_widget.tag_add("keyword", start, end)
-        
-        # Highlight strings
-        string_pattern = r'"[^"]*"'
-        for match in re.finditer(string_pattern, content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text_widget.tag_add("string", start, end)
-        
-        # Highlight single-line comments
-        comment_pattern = r'//.*$'
-        for match in re.finditer(comment_pattern, content, re.MULTILINE):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text_widget.tag_add("comment", start, end)
-        
-        # Highlight multi-line comments
-        multiline_comment_pattern = r'/\*.*?\*/'
-        for match in re.finditer(multiline_comment_pattern, content, re.DOTALL):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text_widget.tag_add("comment", start, end)
-        
-        # Highlight numbers
-        number_pattern = r'\b\d+\.?\d*\b'
-        for match in re.finditer(number_pattern, content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text_widget.tag_add("number", start, end)
-        
-        # Highlight preprocessor directives
-        preprocessor_pattern = r'#\w+'
-        for match in re.finditer(preprocessor_pattern, content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text_widget.tag_add("preprocessor", start, end)
-        
-        # Highlight function names
-        function_pattern = r'\b\w+(?=\s*\()'
-        for match in re.finditer(function_pattern, content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            self.text_widget.tag_add("function", start, end)
\ No newline at end of file
+        """Apply C/SourceMod syntax highlighting to the lines that changed"""
+        if self._needs_full_sync or not self.tracking_edits:
+            content = self.text_widget.get("1.0", "end-1c")
+            lines = content.split('\n')
+            self._needs_full_sync = False
+            
+            changed = self._changed_lines(lines)
+            if changed is not None:
+                self._splice(*changed)
+                self.lines = lines
+                self._edited = True
+        
+        if not self._edited:
+            return
+        self._edited = False
+        self._generation += 1
+        self._submit()
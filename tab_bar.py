@@ -0,0 +1,46 @@
+import customtkinter as ctk
+
+
+class TabBar(ctk.CTkFrame):
+    """Row of buffer tabs with a close button each"""
+
+    def __init__(self, master, on_select, on_close, **kwargs):
+        super().__init__(master, fg_color="transparent", height=32, **kwargs)
+        # on_select(buffer) and on_close(buffer)
+        self.on_select = on_select
+        self.on_close = on_close
+        self._tabs = []
+
+    def refresh(self, buffers, active):
+        """Rebuild the tabs for the given buffers"""
+        for tab in self._tabs:
+            tab.destroy()
+        self._tabs = []
+
+        for column, buffer in enumerate(buffers):
+            selected = buffer is active
+            tab = ctk.CTkFrame(self, corner_radius=6, fg_color="#1f538d" if selected else "#2b2b2b")
+            tab.grid(row=0, column=column, padx=(0, 4))
+
+            ctk.CTkButton(
+                tab,
+                text=buffer.name,
+                command=lambda buffer=buffer: self.on_select(buffer),
+                fg_color="transparent",
+                hover_color="#404040",
+                text_color="#ffffff" if selected else "#A0A0A0",
+                width=60,
+                height=26,
+                font=ctk.CTkFont(size=12, weight="bold" if selected else "normal")
+            ).grid(row=0, column=0, padx=(4, 0), pady=2)
+            ctk.CTkButton(
+                tab,
+                text="✕",
+                command=lambda buffer=buffer: self.on_close(buffer),
+                fg_color="transparent",
+                hover_color="#404040",
+                width=22,
+                height=22
+            ).grid(row=0, column=1, padx=(0, 4), pady=2)
+
+            self._tabs.append(tab)
@@ -0,0 +1,134 @@
+"""A headless stand-in for the parts of tk.Text the editor modules use"""
+import re
+import time
+
+
+class MockText:
+    """Lines of characters with per-character tag sets and an after() queue.
+
+    Indices are "line.column", "line.end", "end" and "end-1c", clamped the way
+    Tk clamps them. Inserted text takes the tags present on both sides of the
+    insertion point, as in Tk, so stale tags show up where Tk would keep them.
+    """
+
+    INDEX = re.compile(r'^(?:(\d+)\.(\d+|end)|end(-1c)?)$')
+
+    def __init__(self, content=''):
+        self.lines = [[(char, frozenset()) for char in line] for line in content.split('\n')]
+        self.view = (0.0, 1.0)
+        self.callbacks = {}
+        self.next_id = 0
+
+    # -- indices
+
+    def _pos(self, index):
+        match = self.INDEX.match(index)
+        if match is None:
+            raise ValueError(f"unsupported index {index!r}")
+        if match.group(1) is None:
+            return len(self.lines) - 1, len(self.lines[-1])
+        line = int(match.group(1)) - 1
+        if line >= len(self.lines):
+            return len(self.lines) - 1, len(self.lines[-1])
+        if match.group(2) == 'end':
+            return line, len(self.lines[line])
+        return line, min(int(match.group(2)), len(self.lines[line]))
+
+    def index(self, index):
+        line, column = self._pos(index)
+        return f"{line + 1}.{column}"
+
+    # -- text
+
+    @property
+    def text(self):
+        return '\n'.join(''.join(char for char, _ in line) for line in self.lines)
+
+    def get(self, start, end):
+        (l1, c1), (l2, c2) = self._pos(start), self._pos(end)
+        if (l1, c1) >= (l2, c2):
+            return ''
+        if l1 == l2:
+            return ''.join(char for char, _ in self.lines[l1][c1:c2])
+        parts = [''.join(char for char, _ in self.lines[l1][c1:])]
+        parts.extend(''.join(char for char, _ in line) for line in self.lines[l1 + 1:l2])
+        parts.append(''.join(char for char, _ in self.lines[l2][:c2]))
+        return '\n'.join(parts)
+
+    def insert(self, index, text):
+        line, column = self._pos(index)
+        current = self.lines[line]
+        before = current[column - 1][1] if column else frozenset()
+        after = current[column][1] if column < len(current) else frozenset()
+        tags = before & after
+        pieces = text.split('\n')
+        new_lines = [[(char, tags) for char in piece] for piece in pieces]
+        new_lines[0] = current[:column] + new_lines[0]
+        new_lines[-1] = new_lines[-1] + current[column:]
+        self.lines[line:line + 1] = new_lines
+
+    def delete(self, start, end):
+        (l1, c1), (l2, c2) = self._pos(start), self._pos(end)
+        if (l1, c1) >= (l2, c2):
+            return
+        self.lines[l1:l2 + 1] = [self.lines[l1][:c1] + self.lines[l2][c2:]]
+
+    # -- tags
+
+    def tag_configure(self, tag, **options):
+        pass
+
+    def _retag(self, tag, start, end, add):
+        (l1, c1), (l2, c2) = self._pos(start), self._pos(end)
+        for line in range(l1, l2 + 1):
+            chars = self.lines[line]
+            first = c1 if line == l1 else 0
+            last = c2 if line == l2 else len(chars)
+            for column in range(first, last):
+                char, tags = chars[column]
+                chars[column] = (char, tags | {tag} if add else tags - {tag})
+
+    def tag_add(self, tag, *indices):
+        for i in range(0, len(indices), 2):
+            self._retag(tag, indices[i], indices[i + 1], True)
+
+    def tag_remove(self, tag, start, end=None):
+        self._retag(tag, start, end or start, False)
+
+    def tags_per_line(self):
+        """[(column, sorted tags)] of every tagged character, per line"""
+        return [
+            [(column, tuple(sorted(tags))) for column, (_, tags) in enumerate(line) if tags]
+            for line in self.lines
+        ]
+
+    # -- view and timers
+
+    def yview(self):
+        return self.view
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_one(self):
+        """Run the oldest scheduled callback; False when none is left"""
+        if not self.callbacks:
+            return False
+        after_id = min(self.callbacks)
+        self.callbacks.pop(after_id)()
+        return True
+
+    def run_pending(self, timeout=10.0):
+        """Run scheduled callbacks until none are left"""
+        deadline = time.monotonic() + timeout
+        while self.run_one():
+            if time.monotonic() > deadline:
+                raise TimeoutError("callbacks kept rescheduling")
+            if self.callbacks:
+                # Give worker threads a chance while only polling remains
+                time.sleep(0.0005)
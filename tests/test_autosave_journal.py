@@ -0,0 +1,137 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autosave_journal import JOURNAL_VERSION, AutosaveJournal, find_journals, load_journal, replay, text_digest
+from mock_text import MockText
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_text_base(self):
+        header = {'version': JOURNAL_VERSION, 'path': None, 'encoding': 'utf-8', 'base': 'text', 'text': 'new a;\nnew b;'}
+        records = [
+            ['i', '1.6', '\nnew c;'],
+            ['d', '1.0', '2.0'],
+            ['i', '2.4', 'bb'],
+        ]
+        self.assertEqual(replay(header, records), 'new c;\nnew bbb;')
+
+    def test_delete_across_lines(self):
+        header = {'version': JOURNAL_VERSION, 'path': None, 'encoding': 'utf-8', 'base': 'text', 'text': 'abc\ndef\nghi'}
+        self.assertEqual(replay(header, [['d', '1.1', '3.2']]), 'ai')
+
+    def test_file_base_checks_the_digest(self):
+        path = os.path.join(self.directory, 'test.sma')
+        with open(path, 'wb') as file:
+            file.write(b'one\r\ntwo\r\n')
+        header = {'version': JOURNAL_VERSION, 'path': path, 'encoding': 'utf-8', 'base': 'file',
+                  'digest': text_digest('one\ntwo\n')}
+        self.assertEqual(replay(header, [['i', '2.3', '!']]), 'one\ntwo!\n')
+
+        with open(path, 'wb') as file:
+            file.write(b'changed\n')
+        with self.assertRaises(ValueError):
+            replay(header, [['i', '2.3', '!']])
+
+
+class AutosaveJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.widget = MockText('new a;')
+        self.journal = AutosaveJournal(self.widget, self.directory)
+
+    def tearDown(self):
+        self.journal.close()
+        self.journal.wait()
+        shutil.rmtree(self.directory)
+
+    def edit(self, operation, *args):
+        if operation == 'insert':
+            self.widget.insert(*args)
+        else:
+            self.widget.delete(*args)
+        self.journal.record(operation, *args)
+
+    def test_flushed_edits_replay_to_the_buffer(self):
+        self.journal.begin(text=self.widget.text)
+        self.edit('insert', '1.6', '\nnew b;')
+        self.journal.flush()
+        self.edit('delete', '1.0', '1.4')
+        self.edit('insert', '2.0', '// ')
+        self.journal.flush()
+        self.journal.wait()
+
+        header, records = load_journal(self.journal.journal_path)
+        self.assertEqual(replay(header, records), self.widget.text)
+
+    def test_compaction_writes_a_snapshot(self):
+        self.journal.compact_records = 5
+        self.journal.begin(text=self.widget.text)
+        for column in range(6):
+            self.edit('insert', f"1.{column}", 'x')
+        self.journal.flush()
+        self.journal.wait()
+
+        header, records = load_journal(self.journal.journal_path)
+        self.assertEqual((header['base'], records), ('text', []))
+        self.assertEqual(header['text'], self.widget.text)
+
+    def test_a_torn_final_record_is_ignored(self):
+        self.journal.begin(text=self.widget.text)
+        self.edit('insert', '1.0', 'a')
+        self.journal.flush()
+        self.journal.wait()
+        with open(self.journal.journal_path, 'a', encoding='utf-8') as file:
+            file.write('["i", "1.0", "unfini')
+
+        header, records = load_journal(self.journal.journal_path)
+        self.assertEqual(replay(header, records), 'anew a;')
+
+    def test_journals_of_this_session_are_not_offered(self):
+        self.journal.begin(text=self.widget.text)
+        self.edit('insert', '1.0', 'a')
+        self.journal.flush()
+        self.journal.wait()
+        self.assertTrue(os.path.exists(self.journal.journal_path))
+        self.assertEqual(find_journals(self.directory), [])
+
+        # Journals of a session that is gone (no lock held) are offered
+        left_over = os.path.join(self.directory, 'ended-1.journal')
+        os.rename(self.journal.journal_path, left_over)
+        self.assertEqual(find_journals(self.directory), [left_over])
+
+    def test_close_stops_the_writer_thread(self):
+        journals = [AutosaveJournal(MockText('a'), self.directory) for _ in range(5)]
+        for journal in journals:
+            journal.begin(text='a')
+            journal.record('insert', '1.0', 'x')
+            journal.flush()
+        workers = [journal._worker for journal in journals]
+        for journal in journals:
+            journal.close()
+        for journal, worker in zip(journals, workers):
+            journal.wait()
+            worker.join(timeout=5)
+            self.assertFalse(worker.is_alive())
+        # The journal files went before the threads stopped
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.journal')], [])
+
+    def test_file_base_needs_the_loaded_digest(self):
+        with self.assertRaises(ValueError):
+            self.journal.begin(path=os.path.join(self.directory, 'test.sma'))
+
+
+if __name__ == '__main__':
+    unittest.main()
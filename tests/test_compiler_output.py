@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiler_output import parse_diagnostic
+
+
+class ParseDiagnosticTest(unittest.TestCase):
+
+    def test_error(self):
+        self.assertEqual(
+            parse_diagnostic('test.sma(12) : error 017: undefined symbol "foo"'),
+            ('test.sma', 12, 'error', '017', 'undefined symbol "foo"')
+        )
+
+    def test_prefixed_statement_spanning_lines_points_at_its_last_line(self):
+        self.assertEqual(
+            parse_diagnostic('// test.sma(12 -- 15) : warning 217: loose indentation'),
+            ('test.sma', 15, 'warning', '217', 'loose indentation')
+        )
+
+    def test_fatal_error(self):
+        diagnostic = parse_diagnostic('test.sma(3) : fatal error 100: cannot read from file: "foo.inc"')
+        self.assertEqual(diagnostic[2:4], ('fatal error', '100'))
+
+    def test_relative_path_is_taken_against_directory(self):
+        directory = os.path.abspath('scripting')
+        diagnostic = parse_diagnostic('test.sma(1) : error 001: expected token', directory)
+        self.assertEqual(diagnostic[0], os.path.join(directory, 'test.sma'))
+
+    def test_path_with_parentheses(self):
+        line = r'C:\Program Files (x86)\Steam\cstrike\addons\amxmodx\scripting\test.sma(7) : error 017: undefined symbol "x"'
+        diagnostic = parse_diagnostic(line)
+        self.assertEqual(diagnostic[0], r'C:\Program Files (x86)\Steam\cstrike\addons\amxmodx\scripting\test.sma')
+        self.assertEqual(diagnostic[1], 7)
+
+    def test_message_that_looks_like_a_diagnostic(self):
+        diagnostic = parse_diagnostic('test.sma(3) : error 029: invalid expression "f(1) : error 2: x"')
+        self.assertEqual(diagnostic[:2], ('test.sma', 3))
+        self.assertEqual(diagnostic[4], 'invalid expression "f(1) : error 2: x"')
+
+    def test_other_lines(self):
+        for line in ('', 'AMX Mod X Compiler 1.10.0', 'Header size:    1024 bytes', '1 Error.'):
+            self.assertIsNone(parse_diagnostic(line))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import codecs
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from encoding_detection import detect_encoding
+
+
+class DetectEncodingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def detect(self, data, **kwargs):
+        path = os.path.join(self.directory, 'test.sma')
+        with open(path, 'wb') as file:
+            file.write(data)
+        return detect_encoding(path, **kwargs)
+
+    def test_ascii_is_utf8(self):
+        self.assertEqual(self.detect(b'new a;\r\nnew b;\r\n'), ('utf-8', '\r\n'))
+        self.assertEqual(self.detect(b'new a;\nnew b;\n'), ('utf-8', '\n'))
+
+    def test_utf8(self):
+        self.assertEqual(self.detect('// çalışma\n'.encode('utf-8')), ('utf-8', '\n'))
+
+    def test_legacy_turkish(self):
+        self.assertEqual(self.detect('// çalışma\r\n'.encode('cp1254')), ('cp1254', '\r\n'))
+
+    def test_bom(self):
+        self.assertEqual(self.detect(codecs.BOM_UTF8 + b'a\r\n'), ('utf-8-sig', '\r\n'))
+        self.assertEqual(self.detect('a\nb'.encode('utf-16')), ('utf-16', '\n'))
+
+    def test_non_ascii_after_the_sample(self):
+        data = b'a\r\n' + b'a' * 100 + 'ş'.encode('cp1254')
+        self.assertEqual(self.detect(data, sample_size=16), ('cp1254', '\r\n'))
+        self.assertEqual(self.detect(b'a\r\n' + b'a' * 100, sample_size=16), ('utf-8', '\r\n'))
+
+    def test_multibyte_sequence_cut_at_the_window_edge(self):
+        # 'ş' is two bytes in UTF-8; the first window ends between them
+        data = 'ş'.encode('utf-8') * 3
+        self.assertEqual(self.detect(data, sample_size=3)[0], 'utf-8')
+        self.assertEqual(self.detect(data, sample_size=1)[0], 'utf-8')
+
+    def test_only_a_window_of_a_large_file_is_decoded(self):
+        data = '// ş\n'.encode('cp1254') + b'new a;\n' * (2 * 1024 * 1024)
+        path = os.path.join(self.directory, 'large.sma')
+        with open(path, 'wb') as file:
+            file.write(data)
+        tracemalloc.start()
+        try:
+            self.assertEqual(detect_encoding(path), ('cp1254', '\n'))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1024 * 1024)
+
+    def test_candidates_in_order(self):
+        data = '// ş'.encode('cp1254')
+        self.assertEqual(self.detect(data, candidates=('utf-8', 'latin-1'))[0], 'latin-1')
+
+    def test_empty_and_single_line_files(self):
+        self.assertEqual(self.detect(b''), ('utf-8', os.linesep))
+        self.assertEqual(self.detect(b'no newline'), ('utf-8', os.linesep))
+        self.assertEqual(self.detect(b'old mac\rline'), ('utf-8', '\r'))
+
+
+if __name__ == '__main__':
+    unittest.main()
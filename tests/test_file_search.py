@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_search import PREVIEW_LENGTH, decode_source, find_matches
+from find_index import compile_search
+
+
+def expected_matches(text, query, mode, match_case):
+    """(line, start, end, preview) from a plain per-line search"""
+    pattern = compile_search(query, mode, match_case)
+    results = []
+    for number, line in enumerate(text.split('\n')):
+        for match in pattern.finditer(line):
+            if match.end() > match.start():
+                results.append((number, match.start(), match.end(), line[:PREVIEW_LENGTH]))
+    return results
+
+
+class FindMatchesTest(unittest.TestCase):
+
+    TEXT = 'public plugin_init()\n{\n    register_plugin("New", "1.0", "me")\n}\n\nnew g_New; // renew\n'
+
+    def test_modes_and_case_match_a_per_line_search(self):
+        for query, mode in (('new', 'text'), ('new', 'word'), ('plugin', 'text'), (r'"[^"]*"', 'regex'), ('{', 'text')):
+            for match_case in (False, True):
+                self.assertEqual(find_matches(self.TEXT, query, mode, match_case),
+                                 expected_matches(self.TEXT, query, mode, match_case), (query, mode, match_case))
+
+    def test_regex_across_line_breaks_is_split_per_line(self):
+        text = 'a\nb a b\n'
+        self.assertEqual(find_matches(text, r'a\s+b', 'regex', False), [(1, 2, 5, 'b a b')])
+
+    def test_lowercasing_that_changes_length(self):
+        # 'İ'.lower() is two characters, so offsets come from the regex instead
+        text = 'İstanbul new\nNEW'
+        self.assertEqual(find_matches(text, 'new', 'text', False), expected_matches(text, 'new', 'text', False))
+
+    def test_long_lines_are_cut_in_the_preview(self):
+        text = 'x' * 500 + 'needle'
+        [(line, start, end, preview)] = find_matches(text, 'needle', 'text', True)
+        self.assertEqual((line, start, end), (0, 500, 506))
+        self.assertEqual(len(preview), PREVIEW_LENGTH)
+
+    def test_no_matches(self):
+        self.assertEqual(find_matches(self.TEXT, 'zzz', 'text', False), [])
+
+
+class DecodeSourceTest(unittest.TestCase):
+
+    def test_first_candidate_that_fits(self):
+        self.assertEqual(decode_source('şğü'.encode('utf-8')), 'şğü')
+        self.assertEqual(decode_source('şğü'.encode('cp1254')), 'şğü')
+
+    def test_bom_and_newlines(self):
+        self.assertEqual(decode_source(b'\xef\xbb\xbfa\r\nb\rc\n'), 'a\nb\nc\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_watcher import changed_line_ranges
+
+
+def apply_ranges(old_text, ranges):
+    """Apply changed_line_ranges() output bottom-up, as FileMenu does in the widget"""
+    lines = old_text.split('\n')
+    for first, old_end, new_lines in reversed(ranges):
+        lines[first:old_end] = new_lines
+    return '\n'.join(lines)
+
+
+class ChangedLineRangesTest(unittest.TestCase):
+
+    def test_identical_texts(self):
+        self.assertEqual(changed_line_ranges('a\nb\n', 'a\nb\n'), [])
+
+    def test_one_changed_line(self):
+        self.assertEqual(changed_line_ranges('a\nb\nc', 'a\nB\nc'), [(1, 2, ['B'])])
+
+    def test_insert_and_delete(self):
+        self.assertEqual(changed_line_ranges('a\nc', 'a\nb\nc'), [(1, 1, ['b'])])
+        self.assertEqual(changed_line_ranges('a\nb\nc', 'a\nc'), [(1, 2, [])])
+
+    def test_ranges_are_ascending_and_disjoint(self):
+        old = '\n'.join(str(i) for i in range(20))
+        new_lines = old.split('\n')
+        new_lines[2] = 'x'
+        new_lines[15:17] = []
+        ranges = changed_line_ranges(old, '\n'.join(new_lines))
+        self.assertEqual(ranges, [(2, 3, ['x']), (15, 17, [])])
+
+    def test_random_edits_apply_to_the_new_text(self):
+        rng = random.Random(9)
+        for _ in range(300):
+            old_lines = [rng.choice('abcde') for _ in range(rng.randint(0, 15))]
+            new_lines = list(old_lines)
+            for _ in range(rng.randint(1, 4)):
+                position = rng.randint(0, len(new_lines))
+                action = rng.random()
+                if action < 0.4:
+                    new_lines.insert(position, rng.choice('abcdef'))
+                elif action < 0.7 and new_lines:
+                    del new_lines[min(position, len(new_lines) - 1)]
+                elif new_lines:
+                    new_lines[min(position, len(new_lines) - 1)] = rng.choice('xyz')
+            old_text, new_text = '\n'.join(old_lines), '\n'.join(new_lines)
+            ranges = changed_line_ranges(old_text, new_text)
+            self.assertEqual(apply_ranges(old_text, ranges), new_text)
+            for (_, end, _), (first, _, _) in zip(ranges, ranges[1:]):
+                self.assertLessEqual(end, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
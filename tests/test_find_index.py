@@ -0,0 +1,100 @@
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from find_index import MatchIndex, compile_search
+
+
+def line_by_line(pattern, text):
+    """Expected line_matches: non-empty matches of pattern found on each line on its own"""
+    return [
+        tuple(match.span() for match in pattern.finditer(line) if match.end() > match.start())
+        for line in text.split('\n')
+    ]
+
+
+class CompileSearchTest(unittest.TestCase):
+
+    def test_modes(self):
+        self.assertEqual(len(compile_search('a.b').findall('a.b axb')), 1)
+        self.assertEqual(len(compile_search('a.b', 'regex').findall('a.b axb')), 2)
+        self.assertEqual(compile_search('new', 'word').findall('new renew newer new'), ['new', 'new'])
+
+    def test_case(self):
+        self.assertEqual(len(compile_search('New').findall('new NEW New')), 3)
+        self.assertEqual(len(compile_search('New', match_case=True).findall('new NEW New')), 1)
+
+    def test_invalid_regex(self):
+        with self.assertRaises(re.error):
+            compile_search('(', 'regex')
+
+
+class MatchIndexTest(unittest.TestCase):
+
+    def test_scan_matches_a_line_by_line_search(self):
+        text = 'new a = 1;\n\nnew b;// new\n  renew new\nend'
+        for query, mode in (('new', 'text'), ('new', 'word'), (r'\w+', 'regex'), ('x*', 'regex')):
+            pattern = compile_search(query, mode)
+            index = MatchIndex(pattern)
+            index.scan(text)
+            self.assertEqual(index.line_matches, line_by_line(pattern, text), query)
+            self.assertEqual(index.count, sum(len(spans) for spans in index.line_matches))
+
+    def test_regex_scanning_across_line_breaks_is_split_per_line(self):
+        pattern = compile_search(r'a\s+b', 'regex')
+        text = 'a\nb a b\na  b'
+        index = MatchIndex(pattern)
+        index.scan(text)
+        self.assertEqual(index.line_matches, [(), ((2, 5),), ((0, 4),)])
+
+    def test_update_matches_a_rescan(self):
+        rng = random.Random(3)
+        pattern = compile_search('ab')
+        lines = [''.join(rng.choice('ab ') for _ in range(rng.randint(0, 12))) for _ in range(60)]
+        index = MatchIndex(pattern)
+        index.scan('\n'.join(lines))
+        for _ in range(200):
+            first = rng.randrange(len(lines))
+            old_end = min(len(lines), first + rng.randint(0, 3))
+            new_lines = [''.join(rng.choice('ab ') for _ in range(rng.randint(0, 12)))
+                         for _ in range(rng.randint(0 if old_end > first else 1, 3))]
+            lines[first:old_end] = new_lines
+            index.update(first, old_end, new_lines)
+            self.assertEqual(index.line_matches, line_by_line(pattern, '\n'.join(lines)))
+            self.assertEqual(index.count, sum(len(spans) for spans in index.line_matches))
+
+    def test_next_match_wraps_around(self):
+        index = MatchIndex(compile_search('foo'))
+        index.scan('foofoo\n\nx foo')
+        self.assertEqual(index.next_match(0, 0), (0, 3, 6))
+        self.assertEqual(index.next_match(0, 3), (2, 2, 5))
+        self.assertEqual(index.next_match(2, 2), (0, 0, 3))
+        self.assertEqual(index.next_match(0, 3, backwards=True), (0, 0, 3))
+        self.assertEqual(index.next_match(0, 0, backwards=True), (2, 2, 5))
+
+    def test_next_match_from_the_column_before_includes_a_match_at_the_cursor(self):
+        index = MatchIndex(compile_search('foo'))
+        index.scan('foofoo')
+        self.assertEqual(index.next_match(0, 3 - 1), (0, 3, 6))
+        self.assertEqual(index.next_match(0, 0 - 1), (0, 0, 3))
+
+    def test_no_matches(self):
+        index = MatchIndex(compile_search('zzz'))
+        index.scan('abc\ndef')
+        self.assertEqual(index.count, 0)
+        self.assertIsNone(index.next_match(0, 0))
+
+    def test_ordinal(self):
+        index = MatchIndex(compile_search('a'))
+        index.scan('a a\nb\na')
+        self.assertEqual(index.ordinal(0, 2), 2)
+        self.assertEqual(index.ordinal(2, 0), 3)
+        self.assertIsNone(index.ordinal(0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
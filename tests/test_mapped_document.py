@@ -0,0 +1,56 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mapped_document
+from mapped_document import MappedDocument
+
+
+class MappedDocumentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, data):
+        path = os.path.join(self.directory, 'test.log')
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_encoding_is_detected_by_build_index_not_the_constructor(self):
+        path = self.write('// ş\r\nnew a;\r\nend'.encode('cp1254'))
+        with mock.patch.object(mapped_document, 'detect_encoding', wraps=mapped_document.detect_encoding) as detect:
+            document = MappedDocument(path)
+            try:
+                self.assertIsNone(document.encoding)
+                detect.assert_not_called()
+                document.build_index(chunk_size=4)
+                detect.assert_called_once()
+                self.assertEqual(document.encoding, 'cp1254')
+                self.assertEqual(document.line_count, 3)
+                self.assertEqual(document.get_lines(0, 3), ['// ş', 'new a;', 'end'])
+            finally:
+                document.close()
+
+    def test_utf16_is_refused(self):
+        path = self.write('a\nb'.encode('utf-16'))
+        document = MappedDocument(path)
+        try:
+            with self.assertRaises(ValueError):
+                document.build_index()
+        finally:
+            document.close()
+        with self.assertRaises(ValueError):
+            MappedDocument(path, encoding='utf-16')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pawn_lexer import (
+    COMMENT, FUNCTION, IN_COMMENT, IN_STRING, KEYWORD, NORMAL, NUMBER, PREPROCESSOR, STRING,
+    PawnLexer, line_offsets, offset_to_index, tokenize
+)
+
+
+class LexLineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lexer = PawnLexer()
+
+    def lex(self, line, state=NORMAL):
+        tokens, state = self.lexer.lex_line(line, state)
+        return [(kind, line[start:end]) for kind, start, end in tokens], state
+
+    def test_keywords_functions_and_numbers(self):
+        self.assertEqual(
+            self.lex('public plugin_init() { new x = 0x1F; while (i < 10.5) {} }'),
+            ([(KEYWORD, 'public'), (FUNCTION, 'plugin_init'), (KEYWORD, 'new'), (NUMBER, '0x1F'),
+              (KEYWORD, 'while'), (NUMBER, '10.5')], NORMAL)
+        )
+
+    def test_preprocessor(self):
+        self.assertEqual(self.lex('#include <amxmodx>'), ([(PREPROCESSOR, '#include')], NORMAL))
+
+    def test_strings_use_caret_escapes_and_hide_comments(self):
+        self.assertEqual(
+            self.lex('new s[] = "a^"b // no" // yes'),
+            ([(KEYWORD, 'new'), (STRING, '"a^"b // no"'), (COMMENT, '// yes')], NORMAL)
+        )
+        self.assertEqual(self.lex("c = 'x';"), ([(STRING, "'x'")], NORMAL))
+
+    def test_keywords_inside_comments_are_not_tagged(self):
+        self.assertEqual(self.lex('/* new if */ return'), ([(COMMENT, '/* new if */'), (KEYWORD, 'return')], NORMAL))
+
+    def test_block_comment_across_lines(self):
+        self.assertEqual(self.lex('a /* b'), ([(COMMENT, '/* b')], IN_COMMENT))
+        self.assertEqual(self.lex('still new', IN_COMMENT), ([(COMMENT, 'still new')], IN_COMMENT))
+        self.assertEqual(self.lex('', IN_COMMENT), ([], IN_COMMENT))
+        self.assertEqual(self.lex('c */ if', IN_COMMENT), ([(COMMENT, 'c */'), (KEYWORD, 'if')], NORMAL))
+
+    def test_string_continued_with_backslash(self):
+        self.assertEqual(self.lex('x = "abc\\'), ([(STRING, '"abc\\')], IN_STRING))
+        self.assertEqual(self.lex('def" + 1', IN_STRING), ([(STRING, 'def"'), (NUMBER, '1')], NORMAL))
+
+    def test_custom_keywords(self):
+        lexer = PawnLexer(('myword',))
+        tokens, _ = lexer.lex_line('myword new')
+        self.assertEqual(tokens, ((KEYWORD, 0, 6),))
+
+
+class TokenizeTest(unittest.TestCase):
+
+    def test_offsets_span_the_whole_buffer(self):
+        text = 'new a;\n/* x\ny */ b()'
+        stream = tokenize(text)
+        self.assertEqual(len(stream), 4)
+        self.assertEqual(
+            [(kind, text[start:end]) for kind, start, end in stream],
+            [(KEYWORD, 'new'), (COMMENT, '/* x'), (COMMENT, 'y */'), (FUNCTION, 'b')]
+        )
+
+    def test_matches_lex_line(self):
+        text = '#define X 1\nstock f(a) {\n  return "s\\\nt" + a; /* c\n*/ }'
+        lexer = PawnLexer()
+        offsets = line_offsets(text)
+        expected = []
+        state = NORMAL
+        for number, line in enumerate(text.split('\n')):
+            tokens, state = lexer.lex_line(line, state)
+            expected.extend((kind, offsets[number] + start, offsets[number] + end) for kind, start, end in tokens)
+        self.assertEqual(list(lexer.tokenize(text)), expected)
+
+    def test_offset_to_index(self):
+        offsets = line_offsets('ab\ncd\n')
+        self.assertEqual(list(offsets), [0, 3, 6])
+        self.assertEqual(offset_to_index(offsets, 0), '1.0')
+        self.assertEqual(offset_to_index(offsets, 4), '2.1')
+        self.assertEqual(offset_to_index(offsets, 6), '3.0')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import random
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from bench_highlighting import generate_source
+from mock_text import MockText
+from pawn_lexer import NORMAL, TOKEN_KINDS, PawnLexer
+from syntax_highlighter import SyntaxHighlighter
+
+
+def expected_tags(text):
+    """Per-line tagged characters for a full lex of text, in MockText.tags_per_line() form"""
+    lexer = PawnLexer()
+    state = NORMAL
+    result = []
+    for line in text.split('\n'):
+        tokens, state = lexer.lex_line(line, state)
+        tagged = []
+        for kind, start, end in tokens:
+            tagged.extend((column, (TOKEN_KINDS[kind],)) for column in range(start, end))
+        result.append(sorted(tagged))
+    return result
+
+
+class HighlighterHarness:
+    """A highlighter over a MockText, with edits reported the way ChangeTracker reports them"""
+
+    def __init__(self, content):
+        self.widget = MockText(content)
+        self.highlighter = SyntaxHighlighter(self.widget)
+        self.highlighter.tracking_edits = True
+
+    def insert(self, line, column, text):
+        """Insert at 0-based (line, column) and report the edit"""
+        self.widget.insert(f"{line + 1}.{column}", text)
+        self.highlighter.note_edit(line, line + 1, line + 1 + text.count('\n'))
+
+    def delete(self, line, column, end_line, end_column):
+        self.widget.delete(f"{line + 1}.{column}", f"{end_line + 1}.{end_column}")
+        self.highlighter.note_edit(line, end_line + 1, line + 1)
+
+    def settle(self):
+        self.highlighter.highlight_syntax()
+        self.widget.run_pending()
+
+    def assert_matches_full_lex(self, test):
+        actual = self.widget.tags_per_line()
+        expected = expected_tags(self.widget.text)
+        test.assertEqual(len(actual), len(expected))
+        wrong_lines = [i for i, (tags, wanted) in enumerate(zip(actual, expected)) if tags != wanted]
+        test.assertEqual(wrong_lines[:10], [])
+
+
+class SyntaxHighlighterTest(unittest.TestCase):
+
+    def test_initial_highlight_matches_full_lex(self):
+        harness = HighlighterHarness(generate_source(3000, seed=3))
+        harness.settle()
+        harness.assert_matches_full_lex(self)
+
+    def test_random_edits_match_full_lex(self):
+        rng = random.Random(7)
+        harness = HighlighterHarness(generate_source(400, seed=5))
+        harness.settle()
+        snippets = ['x', '/*', '*/', '"', '\n', '\n// note\n', 'new a = 1;', '"^"', '\\']
+        for _ in range(150):
+            line = rng.randrange(len(harness.widget.lines))
+            column = rng.randint(0, len(harness.widget.lines[line]))
+            if rng.random() < 0.7:
+                harness.insert(line, column, rng.choice(snippets))
+            else:
+                end_line = min(len(harness.widget.lines) - 1, line + rng.randint(0, 2))
+                end_column = rng.randint(0, len(harness.widget.lines[end_line]))
+                if (end_line, end_column) > (line, column):
+                    harness.delete(line, column, end_line, end_column)
+            harness.settle()
+        harness.assert_matches_full_lex(self)
+
+    def test_edit_while_a_large_file_is_still_lexed(self):
+        harness = HighlighterHarness(generate_source(8000, seed=11))
+        harness.highlighter.worker_chunk_lines = 200
+        harness.highlighter.highlight_syntax()
+        # Let the worker post some chunks, merge part of them, then edit
+        time.sleep(0.02)
+        harness.widget.run_one()
+        harness.insert(5, 0, '\n/*')
+        # Chunks lexed before the edit arrive before it is highlighted
+        time.sleep(0.02)
+        harness.widget.run_one()
+        harness.settle()
+        harness.assert_matches_full_lex(self)
+
+    def test_two_edits_within_one_poll_interval(self):
+        harness = HighlighterHarness(generate_source(300, seed=2))
+        harness.settle()
+        harness.insert(10, 0, 'new x = 5;')
+        harness.highlighter.highlight_syntax()
+        # The first job finishes on the worker before the mainloop polls
+        time.sleep(0.05)
+        harness.insert(20, 0, '\n/* open')
+        # The poll runs before the scheduler gets to highlight the second edit
+        harness.widget.run_one()
+        harness.settle()
+        harness.assert_matches_full_lex(self)
+
+    def test_snapshot_restore_retags_without_lexing(self):
+        content = generate_source(500, seed=4)
+        harness = HighlighterHarness(content)
+        harness.settle()
+        snapshot = harness.highlighter.snapshot()
+        self.assertIsNotNone(snapshot)
+
+        other = HighlighterHarness(content)
+        other.highlighter.restore(snapshot)
+        other.widget.run_pending()
+        other.assert_matches_full_lex(self)
+
+    def test_shutdown_stops_the_lexer_thread(self):
+        harness = HighlighterHarness(generate_source(2000, seed=6))
+        harness.highlighter.highlight_syntax()
+        worker = harness.highlighter._worker
+        self.assertTrue(worker.is_alive())
+        harness.highlighter.shutdown()
+        worker.join(timeout=5)
+        self.assertFalse(worker.is_alive())
+        # Nothing is lexed or scheduled afterwards
+        harness.insert(0, 0, '/*')
+        harness.highlighter.highlight_syntax()
+        harness.widget.run_pending()
+        self.assertIs(harness.highlighter._worker, worker)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,11 +11,22 @@ import subprocess
 from tkinter import font as tkFont
 from PIL import Image, ImageTk
 import ctypes
+import multiprocessing
 
 # Import our custom modules
 from splash_screen import SplashScreen
 from syntax_highlighter import SyntaxHighlighter
 from file_menu import FileMenu
+from update_scheduler import UpdateScheduler
+from line_number_canvas import LineNumberCanvas
+from change_tracker import ChangeTracker
+from autosave_journal import find_journals, load_journal, replay
+from find_bar import FindBar
+from buffer_manager import BufferManager
+from tab_bar import TabBar
+from file_watcher import FileWatcher
+from build_pipeline import BuildPipeline
+from output_panel import OutputPanel
 
 
 
@@ -52,6 +63,10 @@ class CSERCodeEditor:
         # Create main layout
         self.create_main_layout()
         
+        # Draw only the visible line numbers on a canvas instead of keeping
+        # a tk.Text gutter with one entry per line of the document
+        self.virtual_gutter = True
+        
         # Create editor section first
         self.create_editor_section()
         
@@ -62,12 +77,59 @@ class CSERCodeEditor:
         # Setup syntax highlighting after editor is created
         self.syntax_highlighter.setup_syntax_highlighting()
         
+        # Coalesce gutter, scrollbar and highlighting work into one pass per frame
+        self.update_scheduler = UpdateScheduler(self.root, frame_ms=16)
+        self.update_scheduler.register('line_numbers', self.update_line_numbers)
+        self.update_scheduler.register('scrollbar', self.update_horizontal_scrollbar)
+        self.update_scheduler.register('highlight', self.syntax_highlighter.highlight_syntax)
+        self.update_scheduler.register('viewport', self.syntax_highlighter.highlight_visible)
+        
+        # Report exact edit ranges from every insert/delete on the editor
+        self.change_tracker = ChangeTracker(self.code_editor, self.on_text_modified)
+        self.syntax_highlighter.tracking_edits = True
+        
+        # Find bar below the editor, hidden until Ctrl+F / Ctrl+H
+        self.find_bar = FindBar(self.editor_frame, self.code_editor)
+        self.code_editor.bind('<Control-f>', lambda event: self.find_bar.show() or 'break')
+        self.code_editor.bind('<Control-h>', lambda event: self.find_bar.show(replace=True) or 'break')
+        self.code_editor.bind('<F3>', lambda event: self.find_bar.find_next() or 'break')
+        self.code_editor.bind('<Shift-F3>', lambda event: self.find_bar.find_previous() or 'break')
+        
+        # Compiler output below the editor, shown by Compile
+        self.build = None
+        self.output_panel = OutputPanel(self.editor_frame, self.custom_font, on_open=self.open_diagnostic)
+        self.code_editor.tag_configure('diagnostic_error', underline=True)
+        self.code_editor.tag_configure('diagnostic_warning', underline=True)
+        try:
+            self.code_editor.tag_configure('diagnostic_error', underlinefg='#f48771')
+            self.code_editor.tag_configure('diagnostic_warning', underlinefg='#cca700')
+        except tk.TclError:
+            pass  # Tk before 8.6.11 underlines in the text color
+        
+        # Tabs share the one editor widget; each buffer journals its own
+        # unsaved edits so a crash does not lose them
+        self.current_file = None
+        # Open files are watched so changes made by other programs are noticed
+        self.file_watcher = FileWatcher(self.root, self.file_menu.on_file_changed)
+        self.buffers = BufferManager(self)
+        self.buffers.on_change = self.on_buffers_changed
+        self.change_tracker.add_edit_listener(self.on_edit_operation)
+        self.buffers.adopt()
+        self.root.after(500, self.recover_unsaved_buffer)
+        
         # Create compiler/counter section
         self.create_compiler_section()
         
         # Create button section
         self.create_button_section()
         
+        # File menu shortcuts, bound on the editor so they win over the Text class bindings
+        self.code_editor.bind('<Control-n>', lambda event: self.file_menu._new_file() or 'break')
+        self.code_editor.bind('<Control-o>', lambda event: self.file_menu._open_file() or 'break')
+        self.code_editor.bind('<Control-s>', lambda event: self.file_menu._save_file() or 'break')
+        # Closing the window asks about unsaved tabs and clears the journals like File > Exit
+        self.root.protocol("WM_DELETE_WINDOW", self.file_menu._exit_app)
+        
         # Initialize content
         self.on_content_changed()
     
@@ -383,7 +445,7 @@ class CSERCodeEditor:
         self.editor_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=(10, 5))
         
         # Configure editor frame grid
-        self.editor_frame.grid_rowconfigure(1, weight=1)
+        self.editor_frame.grid_rowconfigure(2, weight=1)
         self.editor_frame.grid_columnconfigure(0, weight=1)
         
         # File name section
@@ -430,34 +492,18 @@ class CSERCodeEditor:
         )
         self.extension_label.grid(row=0, column=1, padx=(2, 8), pady=4, sticky="e")
         
+        # Open buffers
+        self.tab_bar = TabBar(self.editor_frame, self.switch_buffer, self.close_buffer)
+        self.tab_bar.grid(row=1, column=0, sticky="w", padx=15, pady=(0, 6))
+        
         # Code editor container with line numbers
         self.editor_container = ctk.CTkFrame(self.editor_frame, corner_radius=8)
-        self.editor_container.grid(row=1, column=0, sticky="nsew", padx=15, pady=(0, 15))
+        self.editor_container.grid(row=2, column=0, sticky="nsew", padx=15, pady=(0, 15))
         self.editor_container.grid_rowconfigure(0, weight=1)
         self.editor_container.grid_columnconfigure(0, weight=0)  # Line numbers
         self.editor_container.grid_columnconfigure(1, weight=1)  # Code editor
         self.editor_container.grid_columnconfigure(2, weight=0)  # Scrollbar
         
-        # Line numbers text widget
-        self.line_numbers = tk.Text(
-            self.editor_container,
-            width=4,
-            padx=3,
-            pady=15,  # Kod editörü ile aynı pady değeri
-            takefocus=0,
-            border=0,
-            state='disabled',
-            wrap='none',
-            font=self.line_font,
-            bg='#2d2d2d',
-            fg='#858585',
-            relief='flat',
-            spacing1=0,  # Satır öncesi boşluk
-            spacing2=0,  # Satır arası boşluk
-            spacing3=0   # Satır sonrası boşluk
-        )
-        self.line_numbers.grid(row=0, column=0, sticky="ns", padx=(10, 0), pady=10)
-        
         # Create text widget with modern styling
         self.code_editor = tk.Text(
             self.editor_container,
@@ -479,7 +525,41 @@ class CSERCodeEditor:
             spacing3=0   # Satır sonrası boşluk
         )
         
-
+        if self.virtual_gutter:
+            # Canvas gutter drawing only the visible line numbers
+            self.line_numbers = LineNumberCanvas(
+                self.editor_container,
+                self.code_editor,
+                font=self.line_font,
+                fg='#858585',
+                bg='#2d2d2d',
+                takefocus=0
+            )
+        else:
+            # Line numbers text widget
+            self.line_numbers = tk.Text(
+                self.editor_container,
+                width=4,
+                padx=3,
+                pady=15,  # Kod editörü ile aynı pady değeri
+                takefocus=0,
+                border=0,
+                state='disabled',
+                wrap='none',
+                font=self.line_font,
+                bg='#2d2d2d',
+                fg='#858585',
+                relief='flat',
+                spacing1=0,  # Satır öncesi boşluk
+                spacing2=0,  # Satır arası boşluk
+                spacing3=0   # Satır sonrası boşluk
+            )
+        self.line_numbers.grid(row=0, column=0, sticky="ns", padx=(10, 0), pady=10)
+        if not self.virtual_gutter:
+            self.line_numbers.tag_configure("center", justify='center')
+        
+        # Number of lines currently shown in the gutter
+        self.gutter_line_count = 0
         
         # Add scrollbars
         self.v_scrollbar = ctk.CTkScrollbar(self.editor_container, command=self.on_scrollbar)
@@ -498,9 +578,8 @@ class CSERCodeEditor:
         self.h_scrollbar.grid(row=1, column=1, sticky="ew", padx=5, pady=(0, 10))
         
         
-        # Bind events for line numbers and syntax highlighting
-        self.code_editor.bind('<KeyRelease>', self.on_content_changed)
-        self.code_editor.bind('<Button-1>', self.on_content_changed)
+        # Line numbers and syntax highlighting follow actual edits through the
+        # change tracker, so caret movement and clicks cost nothing
         self.code_editor.bind('<MouseWheel>', self.on_mouse_wheel)
         
         # Bind auto-indent events
@@ -670,13 +749,54 @@ public event_round_start() {
             command=self.run_code
         )
         self.run_button.grid(row=0, column=3, padx=10, pady=20)
+        
+        # Status area for background work (loading, saving, ...)
+        self.status_frame = ctk.CTkFrame(self.button_frame, fg_color="transparent")
+        self.status_frame.grid(row=0, column=4, sticky="e", padx=(10, 20), pady=20)
+        
+        self.status_label = ctk.CTkLabel(
+            self.status_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=("#7C7C7C", "#A0A0A0")
+        )
+        self.status_label.grid(row=0, column=0, sticky="e")
+        
+        self.status_progress = ctk.CTkProgressBar(self.status_frame, width=160, height=6)
+        self.status_cancel_button = ctk.CTkButton(
+            self.status_frame,
+            text="Cancel",
+            width=70,
+            height=24
+        )
+    
+    def set_status(self, text, progress=None, cancel_command=None):
+        """Show a non-blocking status message, optionally with progress and a cancel button"""
+        self.status_label.configure(text=text)
+        
+        if progress is None:
+            self.status_progress.grid_remove()
+        else:
+            self.status_progress.set(progress)
+            self.status_progress.grid(row=1, column=0, sticky="e", pady=(4, 0))
+        
+        if cancel_command is None:
+            self.status_cancel_button.grid_remove()
+        else:
+            self.status_cancel_button.configure(command=cancel_command)
+            self.status_cancel_button.grid(row=0, column=1, rowspan=2, padx=(10, 0))
+    
+    def clear_status(self):
+        """Hide the status area"""
+        self.set_status("")
+    
+    def update_file_button_icon(self, menu_open):
+        """Point the file button's arrow at the open or closed menu"""
+        self.file_button.configure(text="▲ File" if menu_open else "▼ File")
     
     def update_line_numbers(self):
-        """Update line numbers with center alignment and bounds checking"""
+        """Update line numbers by appending or trimming only the changed lines"""
         try:
-            self.line_numbers.config(state='normal')
-            self.line_numbers.delete('1.0', 'end')
-            
             # Get the number of lines in the code editor with bounds checking
             end_index = self.code_editor.index('end-1c')
             line_count = int(end_index.split('.')[0])
@@ -685,14 +805,29 @@ public event_round_start() {
             if line_count < 1:
                 line_count = 1
             
-            # Generate line numbers with center alignment
-            line_numbers_text = '\n'.join(f"{i:>3}" for i in range(1, line_count + 1))
-            self.line_numbers.insert('1.0', line_numbers_text)
+            # Typing within a line leaves the gutter untouched
+            old_count = self.gutter_line_count
+            if line_count == old_count:
+                return
             
-            # Configure center alignment
-            self.line_numbers.tag_configure("center", justify='center')
-            self.line_numbers.tag_add("center", "1.0", "end")
+            if self.virtual_gutter:
+                self.gutter_line_count = line_count
+                self.line_numbers.redraw()
+                return
+            
+            self.line_numbers.config(state='normal')
+            
+            if line_count > old_count:
+                # Append the new numbers with center alignment
+                line_numbers_text = '\n'.join(f"{i:>3}" for i in range(old_count + 1, line_count + 1))
+                if old_count:
+                    line_numbers_text = '\n' + line_numbers_text
+                self.line_numbers.insert('end-1c', line_numbers_text, "center")
+            else:
+                # Trim the numbers past the new last line
+                self.line_numbers.delete(f"{line_count}.end", 'end-1c')
             
+            self.gutter_line_count = line_count
             self.line_numbers.config(state='disabled')
             
             # Synchronize scroll position immediately
@@ -708,6 +843,10 @@ public event_round_start() {
     def sync_line_numbers_scroll(self):
         """Synchronize line numbers scroll position with code editor"""
         try:
+            if self.virtual_gutter:
+                self.line_numbers.redraw()
+                return
+            
             # Get current scroll position from code editor
             top, bottom = self.code_editor.yview()
             
@@ -715,27 +854,82 @@ public event_round_start() {
             if top is not None and 0.0 <= top <= 1.0:
                 # Apply the same scroll position to line numbers
                 self.line_numbers.yview_moveto(top)
-                
-                # Force immediate update
-                self.line_numbers.update_idletasks()
             
         except Exception as e:
             pass  # Ignore sync errors
     
     def on_content_changed(self, event=None):
         """Handle content changes for line numbers and syntax highlighting"""
-        self.update_line_numbers()
-        # Update horizontal scrollbar
-        self.update_horizontal_scrollbar()
-        # Schedule syntax highlighting to avoid performance issues
-        self.root.after_idle(self.syntax_highlighter.highlight_syntax)
+        # Mark everything dirty; repeated calls within a frame collapse into one pass
+        self.update_scheduler.request('line_numbers', 'scrollbar', 'highlight')
+    
+    def on_text_modified(self, first, old_end, new_end):
+        """Handle an edit reported by the change tracker (0-based line range)"""
+        self.syntax_highlighter.note_edit(first, old_end, new_end)
+        self.find_bar.note_edit(first, old_end, new_end)
+        if new_end != old_end:
+            self.update_scheduler.request('line_numbers', 'highlight')
+        else:
+            self.update_scheduler.request('highlight')
+    
+    def on_edit_operation(self, *operation):
+        """Journal an edit for the buffer shown in the editor"""
+        if self.buffers.active is not None:
+            self.buffers.active.journal.record(*operation)
+    
+    def on_buffers_changed(self):
+        """Refresh the tabs and everything tied to the active buffer"""
+        active = self.buffers.active
+        self.tab_bar.refresh(self.buffers.buffers, active)
+        self.update_title()
+        if self.find_bar.visible:
+            self.find_bar.refresh()
+        self.watch_open_files()
+        self.underline_diagnostics()
+        self.on_content_changed()
+    
+    def set_current_file(self, path):
+        """Link the active buffer to a file on disk"""
+        self.current_file = path
+        if self.buffers.active is not None:
+            self.buffers.active.path = path
+        self.tab_bar.refresh(self.buffers.buffers, self.buffers.active)
+        self.update_title()
+        self.watch_open_files()
+        self.underline_diagnostics()
+    
+    def update_title(self):
+        """Name the active tab in the window title"""
+        if self.buffers.active is not None:
+            self.root.title(f"CSER Code Editor - {self.buffers.active.name}")
+    
+    def watch_open_files(self):
+        """Point the file watcher at the files behind the open buffers"""
+        self.file_watcher.set_paths(buffer.path for buffer in self.buffers.buffers if buffer.path)
+    
+    def switch_buffer(self, buffer):
+        """Show another tab in the editor"""
+        if buffer is self.buffers.active:
+            return
+        # A half-loaded file is not worth keeping
+        self.file_menu._cancel_load()
+        self.buffers.activate(buffer)
+    
+    def close_buffer(self, buffer):
+        """Close a tab, offering to save it first"""
+        if buffer.journal.dirty:
+            result = messagebox.askyesnocancel("Close", f"Do you want to save {buffer.name}?")
+            if result is None:  # Cancel
+                return
+            if result and not self.file_menu.save_buffer(buffer):
+                return
+        if buffer is self.buffers.active:
+            self.file_menu._cancel_load()
+        self.buffers.close(buffer)
     
     def update_horizontal_scrollbar(self):
         """Update horizontal scrollbar based on content width"""
         try:
-            # Force update of the text widget
-            self.code_editor.update_idletasks()
-            
             # Get current horizontal scroll position
             current_view = self.code_editor.xview()
             
@@ -746,13 +940,20 @@ public event_round_start() {
             pass  # Ignore horizontal scroll errors
     
     def on_textscroll(self, *args):
-        """Synchronize line numbers with code editor scroll"""
+        """Lightweight scroll path: sync the gutter and feed viewport highlighting"""
         try:
             # Synchronize line numbers with code editor
             if len(args) >= 2:
                 top_fraction = float(args[0])
                 top_fraction = max(0.0, min(1.0, top_fraction))  # Clamp between 0 and 1
-                self.line_numbers.yview_moveto(top_fraction)
+                if self.virtual_gutter:
+                    self.line_numbers.redraw()
+                else:
+                    self.line_numbers.yview_moveto(top_fraction)
+            
+            # Highlight newly exposed lines on the next frame; scrolling never
+            # marks the document itself as modified
+            self.update_scheduler.request('viewport')
                 
         except Exception as e:
             pass  # Ignore scroll sync errors
@@ -763,8 +964,9 @@ public event_round_start() {
             # Apply scroll to code editor
             self.code_editor.yview(*args)
             
-            # Synchronize line numbers
-            self.line_numbers.yview(*args)
+            # Synchronize line numbers (the canvas gutter follows through on_textscroll)
+            if not self.virtual_gutter:
+                self.line_numbers.yview(*args)
             
         except Exception as e:
             pass  # Ignore scroll errors
@@ -778,9 +980,6 @@ public event_round_start() {
             # Auto-scroll to keep cursor visible
             self.code_editor.see(tk.INSERT)
             
-            # Update line numbers and syntax highlighting
-            self.root.after_idle(self.on_content_changed)
-            
             # Prevent default tab behavior
             return "break"
             
@@ -829,9 +1028,6 @@ public event_round_start() {
             # Auto-scroll to keep cursor visible
             self.code_editor.see(tk.INSERT)
             
-            # Update line numbers and syntax highlighting
-            self.root.after_idle(self.on_content_changed)
-            
             # Prevent default enter behavior
             return "break"
             
@@ -859,9 +1055,6 @@ public event_round_start() {
                     start_pos = f"{line_num}.{col_num-4}"
                     self.code_editor.delete(start_pos, cursor_pos)
                     
-                    # Update line numbers and syntax highlighting
-                    self.root.after_idle(self.on_content_changed)
-                    
                     # Prevent default backspace behavior
                     return "break"
             
@@ -910,9 +1103,6 @@ public event_round_start() {
                         start_pos = f"{line_num}.{last_word.start()}"
                         self.code_editor.delete(start_pos, cursor_pos)
             
-            # Update line numbers and syntax highlighting
-            self.root.after_idle(self.on_content_changed)
-            
             # Prevent default behavior
             return "break"
             
@@ -930,15 +1120,10 @@ public event_round_start() {
             else:
                 delta = -1 if event.num == 4 else 1  # Linux
             
-            # Apply scroll to code editor
+            # Only move the viewport - yscrollcommand syncs the gutter and
+            # scrollbar and feeds viewport highlighting through on_textscroll
             self.code_editor.yview_scroll(int(delta), "units")
             
-            # Immediately synchronize line numbers
-            self.sync_line_numbers_scroll()
-            
-            # Update line numbers and syntax highlighting after scroll
-            self.root.after_idle(self.on_content_changed)
-            
             # Prevent default scroll behavior
             return "break"
             
@@ -970,6 +1155,11 @@ public event_round_start() {
     
 
     
+    def get_scripting_path(self):
+        """AMX Mod X scripting folder below the configured cstrike folder"""
+        cstrike_path = self.cstrike_path_entry.get().strip()
+        return os.path.join(cstrike_path, "addons", "amxmodx", "scripting")
+    
     def update_plugins_ini(self, configs_path, plugin_name):
         """Update plugins.ini file with new plugin"""
         try:
@@ -1050,72 +1240,107 @@ public event_round_start() {
 
 
     def compile_code(self):
-        """Compile button functionality - opens CMD window"""
+        """Compile button functionality - runs the compiler with its output in the output panel"""
+        if self.build is not None and not self.build.finished:
+            self.set_status("A build is already running", cancel_command=self.build.cancel)
+            return
         filename = self.get_full_filename()
         cstrike_path = self.cstrike_path_entry.get().strip()
-        compiler_path = os.path.join(cstrike_path, "addons", "amxmodx", "scripting", "compile.exe")
+        scripting_path = self.get_scripting_path()
+        compiler_path = os.path.join(scripting_path, "compile.exe")
         
         print(f"Compiling {filename}...")
         print(f"🔨 Compiler başlatılıyor: {compiler_path}")
         
-        try:
-            startup_info = subprocess.STARTUPINFO()
-            startup_info.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startup_info.wShowWindow = 1  # SW_NORMAL = 1
-            
-            # Launcher dosyaları için özel kontrol
-            compiler_filename = os.path.basename(compiler_path).lower()
-            if "launcher" in compiler_filename:
-                # Launcher dosyaları parametresiz çalıştır
-                print("🚀 Compiler Launcher dosyası tespit edildi - parametresiz çalıştırılıyor")
-                process = subprocess.Popen(
-                    [compiler_path],
-                    startupinfo=startup_info,
-                    cwd=os.path.dirname(compiler_path) if os.path.dirname(compiler_path) else None
-                )
-                print(f"✅ Compiler Launcher başarıyla başlatıldı (PID: {process.pid})")
-                
-                # Launcher işlemi başarılı olduğunda plugins.ini'yi güncelle
-                self.update_plugins_ini_after_compile(cstrike_path, filename)
-            else:
-                # Normal compiler dosyaları için parametreli çalıştır
-                print("🔨 Normal compiler dosyası - parametreli çalıştırılıyor")
-                process = subprocess.Popen(
-                    [compiler_path, filename],
-                    startupinfo=startup_info,
-                    cwd=os.path.dirname(compiler_path) if os.path.dirname(compiler_path) else None
-                )
-                print(f"✅ Compiler başarıyla başlatıldı (PID: {process.pid})")
-                
-                # Compile işlemi başarılı olduğunda plugins.ini'yi güncelle
-                self.update_plugins_ini_after_compile(cstrike_path, filename)
-                
-        except FileNotFoundError:
-            print(f"❌ Compiler dosyası çalıştırılamadı: {compiler_path}")
-        except Exception as e:
-            print(f"❌ Compiler başlatılırken hata oluştu: {str(e)}")
+        # Launcher dosyaları için özel kontrol
+        compiler_filename = os.path.basename(compiler_path).lower()
+        if "launcher" in compiler_filename:
+            # Launcher dosyaları parametresiz çalıştır
+            print("🚀 Compiler Launcher dosyası tespit edildi - parametresiz çalıştırılıyor")
+            command = [compiler_path]
+        else:
+            # Normal compiler dosyaları için parametreli çalıştır
+            command = [compiler_path, filename]
+        
+        # The compiler writes scripting/compiled/<name>.amxx
+        amxx_filename = filename.replace('.sma', '.amxx') if filename.endswith('.sma') else f"{filename}.amxx"
+        output_path = os.path.join(scripting_path, "compiled", amxx_filename)
+        
+        self.output_panel.clear(" ".join(command))
+        self.output_panel.show()
+        self.underline_diagnostics()
+        # Deploy only runs once the compiler exited cleanly and wrote a fresh .amxx
+        self.build = BuildPipeline(
+            self.root,
+            command,
+            cwd=os.path.dirname(compiler_path) if os.path.dirname(compiler_path) else None,
+            output_path=output_path,
+            deploy=lambda: self.update_plugins_ini_after_compile(cstrike_path, filename),
+            on_line=lambda line: self.output_panel.append(line, scripting_path),
+            on_stage=self.on_build_stage,
+            on_done=self.on_build_done
+        )
+        self.build.start()
+        self.set_status(f"Compiling {filename}...", cancel_command=self.build.cancel)
+    
+    def on_build_stage(self, stage, status, seconds, detail):
+        """Show build progress in the status bar and each finished stage in the output panel"""
+        if status == 'running':
+            self.set_status(f"{stage.capitalize()}...", cancel_command=self.build.cancel)
+            return
+        note = f"{stage}: {status} ({seconds:.2f}s)"
+        if detail:
+            note += f" - {detail}"
+        self.output_panel.note(note)
+    
+    def on_build_done(self, result, timings):
+        """Summarize the build"""
+        self.clear_status()
+        errors, warnings = self.output_panel.counts()
+        outcome = {'deployed': "deployed", 'failed': "not deployed", 'cancelled': "cancelled"}[result]
+        self.output_panel.set_summary(f"{errors} errors, {warnings} warnings - {outcome} in {sum(timings.values()):.2f}s")
+        self.underline_diagnostics()
+    
+    def open_diagnostic(self, diagnostic):
+        """Jump to the line a diagnostic points at, opening its file if needed"""
+        path, line = diagnostic[0], diagnostic[1]
+        self.file_menu._open_location(path, line - 1, 0, 0)
+    
+    def underline_diagnostics(self):
+        """Underline the lines of the active file that the last compile reported"""
+        for tag in ('diagnostic_error', 'diagnostic_warning'):
+            self.code_editor.tag_remove(tag, "1.0", "end")
+        if not self.current_file:
+            return
+        current = os.path.normcase(os.path.abspath(self.current_file))
+        for path, line, kind, code, message in self.output_panel.diagnostics:
+            if os.path.normcase(os.path.abspath(path)) == current:
+                tag = 'diagnostic_warning' if kind == 'warning' else 'diagnostic_error'
+                self.code_editor.tag_add(tag, f"{line}.0", f"{line}.end")
     
     def update_plugins_ini_after_compile(self, cstrike_path, filename):
-        """Update plugins.ini and copy .amxx file after successful compile"""
+        """Update plugins.ini and copy .amxx file after successful compile; True if both worked.
+
+        Runs on the build pipeline's worker thread, so it only touches files.
+        """
         try:
             # 1. Configs klasörü yolunu oluştur
             configs_path = os.path.join(cstrike_path, "addons", "amxmodx", "configs")
             if not os.path.exists(configs_path):
                 print(f"❌ Configs klasörü bulunamadı: {configs_path}")
-                return
-                return
+                return False
             
             # 2. Compiled klasörü yolunu oluştur
             compiled_path = os.path.join(cstrike_path, "addons", "amxmodx", "scripting", "compiled")
             if not os.path.exists(compiled_path):
                 print(f"❌ Compiled klasörü bulunamadı: {compiled_path}")
-                return
+                return False
             
             # 3. Plugins klasörü yolunu oluştur
             plugins_path = os.path.join(cstrike_path, "addons", "amxmodx", "plugins")
             if not os.path.exists(plugins_path):
                 print(f"❌ Plugins klasörü bulunamadı: {plugins_path}")
-                return
+                return False
             
             # Dosya adından .sma uzantısını çıkar
             plugin_name = filename.replace('.sma', '') if filename.endswith('.sma') else filename
@@ -1136,7 +1361,7 @@ public event_round_start() {
             amxx_file_path = self.find_amxx_file_in_compiled(compiled_path, filename)
             if not amxx_file_path:
                 print(f"❌ .amxx dosyası compiled klasöründe bulunamadı")
-                return
+                return False
             
             # 6. .amxx dosyasını plugins klasörüne kopyala
             copy_success = self.copy_amxx_to_plugins(amxx_file_path, plugins_path)
@@ -1144,9 +1369,11 @@ public event_round_start() {
                 print(f"✅ .amxx dosyası plugins klasörüne kopyalandı!")
             else:
                 print(f"❌ .amxx dosyası kopyalanamadı!")
+            return plugins_ini_success and copy_success
                 
         except Exception as e:
             print(f"❌ Compile sonrası işlemlerinde hata: {e}")
+            return False
     
     def run_code(self):
         """Run button functionality - Execute the game/exe file"""
@@ -1198,6 +1425,39 @@ public event_round_start() {
             messagebox.showerror("Hata", f"Oyun başlatılırken hata oluştu:\n{str(e)}")
             print(f"❌ Hata: {str(e)}")
     
+    def recover_unsaved_buffer(self):
+        """Offer to restore buffers whose journals survived a crash, each in its own tab"""
+        for journal_path in find_journals():
+            try:
+                header, records = load_journal(journal_path)
+                text = replay(header, records)
+            except Exception as e:
+                # Keep the edits for recovery by hand, out of the way of the next start
+                kept_path = journal_path + ".unrecovered"
+                try:
+                    os.replace(journal_path, kept_path)
+                except OSError:
+                    kept_path = journal_path
+                messagebox.showwarning("Recover", f"Unsaved changes from a previous session could not be restored:\n{e}\n\nThe journal was kept at:\n{kept_path}")
+                continue
+            
+            path = header.get('path')
+            name = os.path.basename(path) if path else "an untitled file"
+            if messagebox.askyesno("Recover", f"Unsaved changes to {name} were found from a previous session.\n\nRecover them?"):
+                buffer = self.buffers.add_or_reuse()
+                buffer.journal.suspend()
+                self.code_editor.delete("1.0", "end")
+                self.syntax_highlighter.reset()
+                self.code_editor.insert("1.0", text)
+                self.code_editor.edit_reset()
+                self.set_current_file(path)
+                if path:
+                    self.file_menu.file_formats[path] = (header.get('encoding', 'utf-8'), None)
+                # The recovered text is not on disk, so journal it right away
+                buffer.journal.begin(path=path, text=text, encoding=header.get('encoding', 'utf-8'), persist=True)
+                self.on_content_changed()
+            os.remove(journal_path)
+    
     def run(self):
         """Start the application"""
         self.root.mainloop()
@@ -1217,4 +1477,6 @@ def main():
     splash.splash_root.mainloop()
 
 if __name__ == "__main__":
+    # Find in Files starts worker processes; frozen builds need this to spawn them
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+class UpdateScheduler:
+    """Coalesce editor refresh work into at most one pass per frame"""
+
+    def __init__(self, widget, frame_ms=16):
+        self.widget = widget
+        # Minimum time between two update passes
+        self.frame_ms = frame_ms
+        self._tasks = []
+        self._dirty = set()
+        self._after_id = None
+
+    def register(self, name, callback):
+        """Add a named task; tasks run in registration order"""
+        self._tasks.append((name, callback))
+
+    def request(self, *names):
+        """Mark tasks dirty and make sure a pass is scheduled for the next frame"""
+        self._dirty.update(names)
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.frame_ms, self._on_frame)
+
+    def _on_frame(self):
+        """Timer callback for a scheduled pass"""
+        self._after_id = None
+        self.flush()
+
+    def flush(self):
+        """Run every dirty task once, right now"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        dirty = self._dirty
+        self._dirty = set()
+        for name, callback in self._tasks:
+            if name in dirty:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Update task '{name}' failed: {e}")
+
+    def cancel(self):
+        """Drop all pending work"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._dirty.clear()